@@ -0,0 +1,49 @@
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.plumbing import build_bearer_security_scheme_object
+from rest_framework import authentication, exceptions
+
+from .. import tokens
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """Authenticate by `Authorization: Bearer <token>` header.
+
+    Tokens are issued by `TokenLoginView` and are checked without reading
+    session or user from database.
+
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = authentication.get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+
+        user = tokens.get_user_for_token(token)
+        if user is None:
+            raise exceptions.AuthenticationFailed("Invalid or expired token.")
+
+        return user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class SignedTokenAuthenticationScheme(OpenApiAuthenticationExtension):
+    target_class = SignedTokenAuthentication
+    name = "signedTokenAuth"
+
+    def get_security_definition(self, auto_schema):
+        return build_bearer_security_scheme_object(
+            header_name="Authorization",
+            token_prefix=SignedTokenAuthentication.keyword,
+        )
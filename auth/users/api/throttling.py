@@ -0,0 +1,117 @@
+import threading
+import time
+
+from rest_framework import throttling
+
+
+class TokenBucket:
+    """In-process token bucket.
+
+    Every key has up to `capacity` tokens which are refilled continuously,
+    `capacity` tokens per `period` seconds. Buckets are kept in memory of the
+    current process, so checking them costs neither cache nor database query.
+
+    """
+
+    def __init__(self, capacity: int, period: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str) -> float:
+        """Take one token of the `key` bucket.
+
+        Return `0` if token is taken, otherwise number of seconds to wait until
+        the next token is available.
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._get_tokens(key, now)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.refill_rate
+
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                self._drop_full_buckets(now)
+            self._buckets[key] = (tokens - 1, now)
+            return 0
+
+    def _get_tokens(self, key: str, now: float) -> float:
+        """Return number of tokens in the `key` bucket at `now` moment."""
+        if key not in self._buckets:
+            return self.capacity
+        tokens, updated_at = self._buckets[key]
+        return min(
+            self.capacity,
+            tokens + (now - updated_at) * self.refill_rate,
+        )
+
+    def _drop_full_buckets(self, now: float):
+        """Forget buckets which are refilled, they are equal to new ones."""
+        full_keys = [
+            key for key in self._buckets
+            if self._get_tokens(key, now) >= self.capacity
+        ]
+        for key in full_keys:
+            del self._buckets[key]
+
+
+class LoginRateThrottle(throttling.SimpleRateThrottle):
+    """Base throttle of login attempts backed by in-process token buckets.
+
+    Rate is taken from `DEFAULT_THROTTLE_RATES` by `scope`, e.g. `5/min`
+    means bucket of 5 tokens refilled in a minute. Only `POST` requests are
+    throttled, so getting CSRF token is not limited.
+
+    """
+
+    _buckets: dict[str, TokenBucket] = {}
+    _buckets_lock = threading.Lock()
+
+    def allow_request(self, request, view):
+        if request.method != "POST" or self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.wait_time = self.get_bucket().consume(self.key)
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+    def get_bucket(self) -> TokenBucket:
+        """Return bucket shared by all throttles of the same scope."""
+        with self._buckets_lock:
+            if self.scope not in self._buckets:
+                self._buckets[self.scope] = TokenBucket(
+                    capacity=self.num_requests,
+                    period=self.duration,
+                )
+            return self._buckets[self.scope]
+
+
+class LoginIPRateThrottle(LoginRateThrottle):
+    """Limit login attempts made from single IP address."""
+
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginEmailRateThrottle(LoginRateThrottle):
+    """Limit login attempts made for single email."""
+
+    scope = "login_email"
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email")
+        if not email or not isinstance(email, str):
+            return None
+        return email.strip().lower()
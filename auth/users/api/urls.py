@@ -1,11 +1,13 @@
 from django.urls import path
 
-from .views import UserLoginView, UserViewSet, UserProfileViewSet, UserLogoutView
+from .views import UserLoginView, UserViewSet, UserProfileViewSet, UserLogoutView, TokenLoginView, TokenRevokeView
 
 urlpatterns = [
     path("login/", UserLoginView.as_view(), name="UserLogin"),
     path("create-user/", UserViewSet.as_view({"post": "create"}), name="UserCreate"),
     path("profile/", UserProfileViewSet.as_view(), name="UserProfile"),
-    path("logout/", UserLogoutView.as_view(), name="UserLogout")
+    path("logout/", UserLogoutView.as_view(), name="UserLogout"),
+    path("token/", TokenLoginView.as_view(), name="TokenLogin"),
+    path("token/revoke/", TokenRevokeView.as_view(), name="TokenRevoke"),
 ]
 
@@ -1,18 +1,24 @@
 import json
 
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.middleware.csrf import get_token
 from drf_spectacular.utils import extend_schema
 from rest_framework import response, status, views, viewsets, mixins, permissions
 from rest_framework.exceptions import ValidationError
-from auth.users import models
+from auth.users import models, tokens
 from django.contrib.auth.hashers import check_password
 
 from auth.users.api.serializers import UserSerializer, UserCreateSerializer, ChangePasswordSerializer, \
     ChangeUserDetailsSerializer
+from auth.users.api.throttling import LoginIPRateThrottle, LoginEmailRateThrottle
 
 
 class UserLoginView(views.APIView):
+    throttle_classes = (
+        LoginIPRateThrottle,
+        LoginEmailRateThrottle,
+    )
 
     def get(self, request):
         """Return CSRF token."""
@@ -20,6 +26,20 @@ class UserLoginView(views.APIView):
 
     def post(self, request):
         """Login user."""
+        user = self._authenticate(request)
+        if user is None:
+            return self._get_invalid_credentials_response()
+
+        login(request, user)
+        return response.Response(
+            {
+                "status": "ok",
+                "details": "Logged In.",
+            }
+        )
+
+    def _authenticate(self, request) -> models.User | None:
+        """Return user matching email and password from request data."""
         email = request.data.get("email")
         password = request.data.get("password")
 
@@ -27,20 +47,16 @@ class UserLoginView(views.APIView):
 
         user = authenticate(request, email=email, password=password)
         if user is None or not user.is_authenticated:
-            return response.Response(
-                {
-                    "status": "error",
-                    "details": "Email or password is not correct.",
-                },
-                status=status.HTTP_401_UNAUTHORIZED,
-            )
+            return None
+        return user
 
-        login(request, user)
+    def _get_invalid_credentials_response(self) -> response.Response:
         return response.Response(
             {
-                "status": "ok",
-                "details": "Logged In.",
-            }
+                "status": "error",
+                "details": "Email or password is not correct.",
+            },
+            status=status.HTTP_401_UNAUTHORIZED,
         )
 
     def _validate_email_and_password(self, email: str, password: str):
@@ -55,6 +71,45 @@ class UserLoginView(views.APIView):
             )
 
 
+class TokenLoginView(UserLoginView):
+    http_method_names = ("post", "options")
+
+    @extend_schema(
+        responses={200: 'Signed token for `Authorization: Bearer` header'}
+    )
+    def post(self, request):
+        """Return signed token for stateless authentication."""
+        user = self._authenticate(request)
+        if user is None:
+            return self._get_invalid_credentials_response()
+
+        return response.Response(
+            {
+                "status": "ok",
+                "token": tokens.create_token(user),
+                "expires_in": settings.TOKEN_AUTH["MAX_AGE"],
+            }
+        )
+
+
+class TokenRevokeView(views.APIView):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    @extend_schema(
+        responses={200: 'All tokens of user are revoked'}
+    )
+    def post(self, request):
+        """Revoke all tokens issued for current user."""
+        tokens.revoke_tokens(request.user)
+        return response.Response(
+            {
+                "status": "ok",
+                "details": "Tokens revoked.",
+            },
+            status=status.HTTP_200_OK
+        )
+
+
 class UserViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     serializer_class = UserCreateSerializer
 
@@ -86,6 +141,7 @@ class UserProfileViewSet(views.APIView):
         user = request.user
         user.set_password(serializer.validated_data['new_password'])
         user.save()
+        tokens.revoke_tokens(user)
         return response.Response({"success": "Password successfully set"}, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 hasher with costs from `PASSWORD_HASHER_PARAMS` setting."""
+
+    time_cost = settings.PASSWORD_HASHER_PARAMS["argon2"]["time_cost"]
+    memory_cost = settings.PASSWORD_HASHER_PARAMS["argon2"]["memory_cost"]
+    parallelism = settings.PASSWORD_HASHER_PARAMS["argon2"]["parallelism"]
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Scrypt hasher with costs from `PASSWORD_HASHER_PARAMS` setting."""
+
+    work_factor = settings.PASSWORD_HASHER_PARAMS["scrypt"]["work_factor"]
+    block_size = settings.PASSWORD_HASHER_PARAMS["scrypt"]["block_size"]
+    parallelism = settings.PASSWORD_HASHER_PARAMS["scrypt"]["parallelism"]
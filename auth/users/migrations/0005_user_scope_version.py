@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='scope_version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on changes of classes and students of the coach'),
+        ),
+    ]
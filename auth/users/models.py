@@ -64,6 +64,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     )
     is_superuser = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Incremented to revoke all issued tokens of the user",
+    )
+    scope_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Incremented on changes of classes and students of the coach",
+    )
 
     objects = UserManager()
 
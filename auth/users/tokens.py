@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import User
+
+SALT = "auth.users.tokens"
+
+
+def create_token(user: User) -> str:
+    """Return HMAC signed token of the user with current timestamp."""
+    return signing.dumps(
+        {"id": user.pk, "version": user.token_version},
+        salt=SALT,
+    )
+
+
+def get_user_for_token(token: str) -> User | None:
+    """Return user of valid token or `None`.
+
+    Only token version is checked against the cache, so no database query is
+    made for valid tokens. Returned user has all fields except `id` and
+    `token_version` deferred, they are loaded from database on first access.
+
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=SALT,
+            max_age=settings.TOKEN_AUTH["MAX_AGE"],
+        )
+    except signing.BadSignature:
+        return None
+
+    if get_token_version(payload["id"]) != payload["version"]:
+        return None
+
+    return User.from_db(
+        None,
+        ["id", "token_version"],
+        [payload["id"], payload["version"]],
+    )
+
+
+def get_token_version(user_id: int) -> int | None:
+    """Return current token version of the user, cached."""
+    version = cache.get(_get_version_cache_key(user_id))
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id,
+        ).values_list("token_version", flat=True).first()
+        if version is None:
+            return None
+        _cache_token_version(user_id, version)
+    return version
+
+
+def revoke_tokens(user: User):
+    """Invalidate all tokens issued for the user."""
+    User.objects.filter(pk=user.pk).update(
+        token_version=F("token_version") + 1,
+    )
+    user.refresh_from_db(fields=["token_version"])
+    _cache_token_version(user.pk, user.token_version)
+
+
+def _cache_token_version(user_id: int, version: int):
+    cache.set(
+        _get_version_cache_key(user_id),
+        version,
+        settings.TOKEN_AUTH["VERSION_CACHE_TIMEOUT"],
+    )
+
+
+def _get_version_cache_key(user_id: int) -> str:
+    return f"users:token-version:{user_id}"
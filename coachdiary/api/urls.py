@@ -1,4 +1,5 @@
 from auth.users.api.urls import urlpatterns as users_api_urlpatterns
+from jobs.api.urls import urlpatterns as jobs_api_urlpatterns
 from standards.api.urls import urlpatterns as standards_api_urlpatterns
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from django.urls import path
@@ -6,6 +7,7 @@ from django.urls import path
 urlpatterns = [
     *users_api_urlpatterns,
     *standards_api_urlpatterns,
+    *jobs_api_urlpatterns,
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path('docs/', SpectacularSwaggerView.as_view(url_name='schema'),name='docs'),
 ]
@@ -0,0 +1,83 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+
+def get_fingerprint(request, queryset, fields):
+    """Return ETag of rows of the queryset shown to the request.
+
+    `fields` are paths to modification times of the rows and of related
+    rows shown with them. Everything is read by a single aggregate query.
+    Number of rows is a part of ETag, so removed rows change it too. The
+    same rows rendered for another user, URL or media type get another ETag.
+
+    Latest modification time is not sent as Last-Modified, it goes back
+    when the latest modified row is deleted, and a client asking with
+    If-Modified-Since would be told its copy with the row is current.
+
+    """
+    aggregates = {f"last_modified_{index}": Max(field) for index, field in enumerate(fields)}
+    row = queryset.order_by().aggregate(
+        count=Count("pk", distinct=True),
+        **aggregates,
+    )
+    last_modified = max(
+        (row[name] for name in aggregates if row[name] is not None),
+        default=None,
+    )
+    parts = (
+        request.user.pk,
+        request.get_full_path(),
+        request.accepted_renderer.media_type,
+        row["count"],
+        last_modified and last_modified.isoformat(),
+    )
+    return '"%s"' % hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+def get_not_modified_response(request, etag):
+    """Return 304 response if client's copy is current, None otherwise."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def set_conditional_headers(response, etag):
+    response["ETag"] = etag
+    # Representation depends on the renderer negotiated by Accept header
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer GET of list and retrieve with 304 when nothing has changed.
+
+    Freshness is checked before the rows are loaded and serialized, by
+    one aggregate query over `conditional_fields` of the filtered
+    queryset.
+
+    """
+    conditional_fields = ("updated_at",)
+
+    def conditional(self, request, queryset, get_response, *args, **kwargs):
+        etag = get_fingerprint(request, queryset, self.conditional_fields)
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+        response = get_response(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_conditional_headers(response, etag)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional(request, queryset, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]},
+        )
+        return self.conditional(request, queryset, super().retrieve, *args, **kwargs)
@@ -0,0 +1,111 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+# `orjson` is optional, stdlib `json` is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Render JSON by `orjson`, output is the same as of `JSONRenderer`.
+
+    Types unknown to orjson, like Decimal or lazy translations, are
+    converted by DRF's encoder. Indented output requested by `indent`
+    parameter of media type is left to `JSONRenderer`.
+
+    """
+
+    options = 0 if orjson is None else (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encoders.JSONEncoder().default, option=self.options)
+        except orjson.JSONEncodeError:
+            # Like integers over 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as of `JSONRenderer`, these are invalid in JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """Render list of objects column by column.
+
+    `[{"id": 1, "student_class": {"id": 7, ...}}, ...]` is rendered as
+
+        {
+            "count": 1,
+            "columns": {"id": [1], "student_class": [7]},
+            "lookups": {"student_class": {"7": {"id": 7, ...}}}
+        }
+
+    so keys are not repeated per row and nested objects having `id` are
+    emitted once in `lookups` and referenced by id from columns. Data of
+    other shape (single objects, errors) is rendered as usual JSON.
+
+    Selected by `Accept: application/vnd.coachdiary.columnar+json` header or
+    `?format=columnar` query parameter.
+
+    """
+
+    media_type = "application/vnd.coachdiary.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+            data = to_columns(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def to_columns(rows: list[dict]) -> dict:
+    """Convert list of objects to columns with de-duplicated nested objects."""
+    keys = dict.fromkeys(key for row in rows for key in row)
+    columns = {
+        key: [row.get(key) for row in rows]
+        for key in keys
+    }
+
+    lookups = {}
+    for key, values in columns.items():
+        if not _is_lookup_column(values):
+            continue
+        lookup = {}
+        for value in values:
+            if value is not None:
+                lookup.setdefault(value["id"], value)
+        lookups[key] = lookup
+        columns[key] = [
+            value["id"] if value is not None else None
+            for value in values
+        ]
+
+    return {
+        "count": len(rows),
+        "columns": columns,
+        "lookups": lookups,
+    }
+
+
+def _is_lookup_column(values: list) -> bool:
+    """Check whether column consists of nested objects with ids."""
+    has_objects = False
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, dict) or "id" not in value:
+            return False
+        has_objects = True
+    return has_objects
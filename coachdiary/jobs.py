@@ -0,0 +1,8 @@
+from django.core.management import call_command
+
+from jobs.registry import register
+
+
+@register("create_test_data")
+def create_test_data(job):
+    call_command("create_test_data")
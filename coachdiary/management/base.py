@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from coachdiary.profiling import profile
+
+
+class ProfiledCommand(BaseCommand):
+    """Command with `--profile` option reporting its queries.
+
+    With `--profile-output` cProfile stats are written to the file too.
+
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Report queries made by the command, see `coachdiary.profiling`",
+        )
+        parser.add_argument(
+            "--profile-output",
+            help="File cProfile stats are written to, implies --profile",
+        )
+        return parser
+
+    def execute(self, *args, **options):
+        profile_output = options.pop("profile_output", None)
+        if options.pop("profile", False) or profile_output:
+            # Only `handle()` is profiled, without system checks
+            self.handle = profile(output=profile_output, stream=self.stderr)(self.handle)
+        return super().execute(*args, **options)
@@ -0,0 +1,39 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+
+from coachdiary.management.base import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Measure password checks per second of configured hashers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=20,
+            help="Number of password checks per hasher",
+        )
+
+    def handle(self, *args, rounds, **kwargs):
+        for hasher in get_hashers():
+            try:
+                encoded = hasher.encode("password", hasher.salt())
+            except ValueError as error:
+                # Hasher's optional library is not installed
+                self.stdout.write(
+                    self.style.WARNING(f"{hasher.algorithm}: {error}"),
+                )
+                continue
+
+            start_time = time.perf_counter()
+            for _ in range(rounds):
+                hasher.verify("password", encoded)
+            elapsed_time = time.perf_counter() - start_time
+
+            self.stdout.write(
+                f"{hasher.algorithm}: "
+                f"{rounds / elapsed_time:.1f} logins/s per core "
+                f"({elapsed_time / rounds * 1000:.1f} ms per check)"
+            )
@@ -0,0 +1,335 @@
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth.users.models import User
+from coachdiary.management.base import ProfiledCommand
+from coachdiary.query_growth import capture_queries, format_query_growth, get_query_growth
+from standards import models
+from standards.api.urls import standards_router
+from standards.deletion import soft_delete_classes, soft_delete_students
+from standards.scope import invalidate_owner_scope
+
+CLASS_LETTERS = "АБВГДЕЖЗИК"
+# Some queries are made per grade, like relinking of levels, so all sizes
+# have classes of the same grades
+CLASS_NUMBERS = (3, 4)
+# Rows added per unit of dataset size
+STUDENTS_PER_CLASS = 5
+ATTEMPTS_PER_RESULT = 2
+# Default sizes of datasets compared
+SMALL_SIZE = 2
+LARGE_SIZE = 5
+
+
+class Dataset:
+    """Data of a coach which grows by units.
+
+    Every unit adds a class with students and a standard. All students
+    get results with attempts for the new standard, so rows returned for
+    a single student grow too. A deleted class and a deleted student are
+    added for restore.
+
+    """
+
+    def __init__(self):
+        self.owner = User.objects.create_user(
+            email="query-growth-owner@example.com",
+            password="password",
+            name="owner",
+        )
+        other = User.objects.create_user(
+            email="query-growth-other@example.com",
+            password="password",
+            name="other",
+        )
+        self.template = self.create_standard(other, is_template=True)
+        self.subscribed_template = self.create_standard(other, is_template=True)
+        models.StandardSubscription.objects.create(
+            user=self.owner,
+            standard=self.subscribed_template,
+        )
+        self.size = 0
+        self.classes = []
+        self.students = []
+        self.standards = []
+        self.deleted_classes = []
+        self.deleted_students = []
+
+    def create_standard(self, owner, **kwargs):
+        standard = models.Standard.objects.create(
+            name=f"Норматив {owner.pk}",
+            who_added=owner,
+            has_numeric_value=True,
+            **kwargs,
+        )
+        models.Level.objects.bulk_create(
+            models.Level(
+                standard=standard,
+                level_number=level_number,
+                gender=gender,
+                low_level_value=1,
+                middle_level_value=5,
+                high_level_value=9,
+            )
+            for level_number in range(1, 12)
+            for gender in models.Level.Gender.values
+        )
+        return standard
+
+    def create_class(self, index):
+        return models.StudentClass.objects.create(
+            number=CLASS_NUMBERS[index % len(CLASS_NUMBERS)],
+            class_name=CLASS_LETTERS[index // len(CLASS_NUMBERS)],
+            class_owner=self.owner,
+        )
+
+    def create_students(self, student_class, index, count):
+        return models.Student.objects.bulk_create(
+            models.Student(
+                full_name=f"Иванов Иван {index}-{number}",
+                student_class=student_class,
+                birthday=datetime.date(2012, 1, number + 1),
+                gender=models.Level.Gender.values[number % 2],
+            )
+            for number in range(count)
+        )
+
+    def grow(self, size: int):
+        for index in range(self.size, size):
+            student_class = self.create_class(index)
+            self.classes.append(student_class)
+            self.students.extend(self.create_students(student_class, index, STUDENTS_PER_CLASS))
+            deleted_class = self.create_class(index)
+            self.deleted_classes.append(deleted_class)
+            deleted_students = [
+                *self.create_students(deleted_class, index, STUDENTS_PER_CLASS),
+                *self.create_students(student_class, index, 1),
+            ]
+            self.deleted_students.append(deleted_students[-1])
+
+            standard = self.create_standard(self.owner)
+            self.standards.append(standard)
+            results = models.StudentStandard.objects.bulk_create(
+                models.StudentStandard(student=student, standard=standard, value=5, grade=4)
+                for student in self.students + deleted_students
+            )
+            models.StudentStandard.objects.filter(standard=standard).relink_levels()
+            now = timezone.now()
+            models.StudentStandardAttempt.objects.bulk_create(
+                models.StudentStandardAttempt(
+                    student_id=result.student_id,
+                    standard=standard,
+                    value=result.value,
+                    grade=result.grade,
+                    school_year=now.year,
+                    recorded_at=now - datetime.timedelta(days=30 * number),
+                )
+                for result in results
+                for number in range(ATTEMPTS_PER_RESULT)
+            )
+            soft_delete_classes(models.StudentClass.objects.filter(pk=deleted_class.pk))
+            soft_delete_students(models.Student.objects.filter(pk=deleted_students[-1].pk))
+        self.size = size
+
+
+def get_requests(dataset: Dataset) -> dict[str, list[tuple]]:
+    """Return requests by names of routes, as (method, url kwargs, data)."""
+    student = dataset.students[0]
+    student_class = dataset.classes[0]
+    standard = dataset.standards[0]
+    result = {
+        "student_id": student.pk,
+        "standard_id": standard.pk,
+        "value": 7,
+    }
+    levels = [
+        {
+            "level_number": level_number,
+            "gender": gender,
+            "low_level_value": 1,
+            "middle_level_value": 5,
+            "high_level_value": 9,
+        }
+        for level_number in (1, 2)
+        for gender in models.Level.Gender.values
+    ]
+    standard_data = {"name": "Бег", "has_numeric_value": True, "levels": levels}
+    student_data = {
+        "full_name": "Петров Петр",
+        "student_class": {"number": student_class.number, "class_name": student_class.class_name},
+        "birthday": "2012-01-01",
+        "gender": "m",
+    }
+    results_query = {"class_id[]": [c.pk for c in dataset.classes], "standard_id": standard.pk}
+    return {
+        "api-root": [("get", {}, None)],
+        "students-standards-list": [("get", {}, None), ("post", {}, standard_data)],
+        "students-standards-templates": [("get", {}, None)],
+        "students-standards-detail": [
+            ("get", {"pk": standard.pk}, None),
+            ("put", {"pk": standard.pk}, standard_data),
+            ("delete", {"pk": standard.pk}, None),
+        ],
+        "students-standards-progress": [
+            ("get", {"pk": standard.pk}, {"class_id": student_class.pk}),
+            ("get", {"pk": standard.pk}, {"student_id": student.pk, "bucket": "term"}),
+        ],
+        "students-standards-subscribe": [("post", {"pk": dataset.template.pk}, None)],
+        "students-standards-unsubscribe": [("post", {"pk": dataset.subscribed_template.pk}, None)],
+        "students-list": [("get", {}, None), ("post", {}, student_data)],
+        "students-results": [("get", {}, results_query)],
+        "students-search": [("get", {}, {"q": "Иванов"})],
+        "students-bulk-delete": [
+            ("post", {}, {"student_ids": [s.pk for s in dataset.students if s.student_class_id == student_class.pk]}),
+        ],
+        "students-restore": [("post", {}, {"student_ids": [s.pk for s in dataset.deleted_students]})],
+        "students-transfer": [("post", {}, {
+            "student_ids": [s.pk for s in dataset.students if s.student_class_id != student_class.pk],
+            "class_id": student_class.pk,
+        })],
+        "students-detail": [
+            ("get", {"pk": student.pk}, None),
+            ("put", {"pk": student.pk}, student_data),
+            ("delete", {"pk": student.pk}, None),
+        ],
+        "classes-list": [("get", {}, None)],
+        "classes-rollover": [("post", {}, None)],
+        "classes-detail": [
+            ("get", {"pk": student_class.pk}, None),
+            ("delete", {"pk": student_class.pk}, None),
+        ],
+        "classes-restore": [("post", {}, {"class_ids": [c.pk for c in dataset.deleted_classes]})],
+        "sync-list": [
+            ("get", {}, None),
+            ("get", {}, {"cursor": (timezone.now() - datetime.timedelta(days=1)).isoformat()}),
+        ],
+        "sync-results": [("post", {}, [{**result, "recorded_at": timezone.now().isoformat()}])],
+        "student-standards-list": [("get", {"student_id": student.pk}, None)],
+        "student-standards-percentiles": [("get", {"student_id": student.pk}, None)],
+        # Shadowed by `students-results` registered for the same URL
+        "students-results-list": [("get", {}, results_query)],
+        "students-results-create-create-or-update": [("post", {}, [result])],
+    }
+
+
+def iter_requests(requests: dict[str, list[tuple]]):
+    """Yield requests with keys, which are the same for all sizes of dataset."""
+    for name, route_requests in requests.items():
+        for index, (method, url_kwargs, data) in enumerate(route_requests):
+            yield (name, index), (name, method, url_kwargs, data)
+
+
+def make_request(dataset: Dataset, name, method, url_kwargs, data):
+    """Return rendered response to the request of the dataset owner.
+
+    Changes made by the request are rolled back and cached scope of the
+    owner is dropped, so every request starts with the same data and cold
+    caches.
+
+    """
+    url = reverse(name, kwargs=url_kwargs)
+    factory = APIRequestFactory()
+    if method == "get":
+        http_request = factory.get(url, data)
+    else:
+        http_request = getattr(factory, method)(url, data, format="json")
+    force_authenticate(http_request, dataset.owner)
+    match = http_request.resolver_match = resolve(url)
+
+    invalidate_owner_scope(dataset.owner.pk)
+    # Request factory uses "testserver" host, which API root needs for
+    # absolute URLs
+    with (
+        override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]),
+        transaction.atomic(),
+    ):
+        response = match.func(http_request, *match.args, **match.kwargs)
+        response.render()
+        transaction.set_rollback(True)
+    return response
+
+
+class Command(ProfiledCommand):
+    help = (
+        "Check that number of queries of standards API endpoints does not "
+        "grow with number of rows. Data is created in a transaction which "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--small",
+            type=int,
+            default=SMALL_SIZE,
+            help="Size of small dataset, in classes with a standard each",
+        )
+        parser.add_argument(
+            "--large",
+            type=int,
+            default=LARGE_SIZE,
+            help="Size of large dataset",
+        )
+
+    def handle(self, *args, small, large, **kwargs):
+        max_size = len(CLASS_NUMBERS) * len(CLASS_LETTERS)
+        if not len(CLASS_NUMBERS) <= small < large <= max_size:
+            raise CommandError(
+                f"Sizes must satisfy {len(CLASS_NUMBERS)} <= small < large <= {max_size}.",
+            )
+
+        with transaction.atomic():
+            failures = self.compare(small, large)
+            transaction.set_rollback(True)
+        # Rolled back versions of owner scopes are reused by later changes,
+        # so ids cached for them must not outlive the check
+        cache.clear()
+
+        if failures:
+            raise CommandError(f"Query count grows with data for {failures} requests.")
+        self.stdout.write(self.style.SUCCESS("Query counts do not depend on data size."))
+
+    def compare(self, small: int, large: int) -> int:
+        dataset = Dataset()
+        dataset.grow(small)
+        requests = get_requests(dataset)
+        names = {pattern.name for pattern in standards_router.urls}
+        missing = names - set(requests)
+        if missing:
+            raise CommandError(f"No requests to check for routes: {', '.join(sorted(missing))}.")
+
+        small_counts = {
+            key: self.measure(dataset, *request)
+            for key, request in iter_requests(requests)
+        }
+        dataset.grow(large)
+        failures = 0
+        for key, request in iter_requests(get_requests(dataset)):
+            name, method, url_kwargs, data = request
+            large_counts = self.measure(dataset, *request)
+            growth = get_query_growth(small_counts[key], large_counts)
+            label = f"{method.upper()} {name}"
+            if growth:
+                failures += 1
+                self.stdout.write(self.style.ERROR(
+                    f"{label}: {sum(small_counts[key].values())} -> {sum(large_counts.values())} queries",
+                ))
+                self.stdout.write(format_query_growth(growth))
+            else:
+                self.stdout.write(f"{label}: {sum(large_counts.values())} queries")
+        return failures
+
+    def measure(self, dataset, name, method, url_kwargs, data):
+        def run():
+            response = make_request(dataset, name, method, url_kwargs, data)
+            if response.status_code >= 400:
+                raise CommandError(f"{method.upper()} {name}: {response.status_code} {response.data}")
+
+        return capture_queries(run)
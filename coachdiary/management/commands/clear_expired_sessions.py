@@ -0,0 +1,37 @@
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from coachdiary.management.base import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = (
+        "Delete expired sessions from database in batches. "
+        "Meant to be run periodically, e.g. by cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of sessions deleted by single query",
+        )
+
+    def handle(self, *args, batch_size, **kwargs):
+        now = timezone.now()
+        expired_sessions = Session.objects.filter(expire_date__lt=now)
+
+        deleted_count = 0
+        while True:
+            batch = list(
+                expired_sessions.values_list("pk", flat=True)[:batch_size],
+            )
+            if not batch:
+                break
+            Session.objects.filter(pk__in=batch).delete()
+            deleted_count += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted_count} expired sessions."),
+        )
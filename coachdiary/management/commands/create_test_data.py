@@ -1,16 +1,30 @@
 import datetime
 import random
 import time
-from django.core.management.base import BaseCommand
 from django.utils import timezone
+from coachdiary.management.base import ProfiledCommand
 from standards.models import StudentClass, Student, Standard, Level, StudentStandard
 from auth.users.models import User
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = "Create test data for models"
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Create background job instead, see `run_jobs_worker`",
+        )
+
+    def handle(self, *args, enqueue=False, **kwargs):
+        if enqueue:
+            from jobs.registry import enqueue as enqueue_job
+
+            job = enqueue_job("create_test_data")
+            self.stdout.write(self.style.SUCCESS(f'Created job {job.pk}.'))
+            return
+
         # Start timing
         start_time = time.time()
 
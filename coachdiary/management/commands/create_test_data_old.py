@@ -2,13 +2,13 @@ import datetime
 import random
 import time
 import logging
-from django.core.management.base import BaseCommand
+from coachdiary.management.base import ProfiledCommand
 from django.utils import timezone
 from standards.models import StudentClass, Student, Standard, Level, StudentStandard
 from auth.users.models import User
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = "Create test data for models"
 
     def handle(self, *args, **kwargs):
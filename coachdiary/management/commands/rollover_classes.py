@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import CommandError
+
+from auth.users.models import User
+from coachdiary.management.base import ProfiledCommand
+from standards.models import StudentClass
+from standards.rollover import RolloverError, rollover_classes
+
+
+class Command(ProfiledCommand):
+    help = (
+        "Promote classes to the next grade and archive graduates. "
+        "Run once at the start of a school year."
+    )
+
+    def add_arguments(self, parser):
+        owner = parser.add_mutually_exclusive_group(required=True)
+        owner.add_argument(
+            "--owner",
+            help="Email of the coach whose classes are promoted",
+        )
+        owner.add_argument(
+            "--all",
+            action="store_true",
+            dest="all_owners",
+            help="Promote classes of all coaches",
+        )
+
+    def handle(self, *args, owner=None, all_owners=False, **kwargs):
+        if all_owners:
+            users = User.objects.filter(
+                pk__in=StudentClass.objects.values("class_owner_id"),
+            ).order_by("email")
+        else:
+            try:
+                users = [User.objects.get(email=owner.lower())]
+            except User.DoesNotExist:
+                raise CommandError(f"User {owner} does not exist.")
+
+        start_time = time.time()
+        failed_count = 0
+        for user in users:
+            try:
+                counts = rollover_classes(user)
+            except RolloverError as error:
+                if not all_owners:
+                    raise CommandError(str(error))
+                # Other coaches are still promoted
+                failed_count += 1
+                self.stderr.write(f"{user.email}: {error}")
+                continue
+            self.stdout.write(user.email)
+            for name, count in counts.items():
+                self.stdout.write(f"  {name}: {count}")
+        elapsed_time = time.time() - start_time
+
+        if failed_count:
+            raise CommandError(f"Classes of {failed_count} coaches were not promoted.")
+        self.stdout.write(self.style.SUCCESS(f"Rollover finished in {elapsed_time:.2f} seconds."))
@@ -0,0 +1,205 @@
+"""Compression of responses.
+
+JSON and other text payloads of the API are compressed by the best coding
+accepted by the client: zstd and brotli when their libraries are installed,
+gzip otherwise. HTML is not compressed, as pages of admin and browsable
+API contain CSRF token, which can be guessed by BREACH attack through
+compressed size.
+
+Compressed bodies of responses having ETag, or served by views listed in
+`COMPRESSION_CACHED_URL_NAMES`, are cached by hash of the body, so
+payloads repeated for many requests are compressed once.
+
+"""
+import hashlib
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+
+# `zstandard` and `brotli` are optional, gzip is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPE_RE = re.compile(
+    r"^(text/(plain|csv|css|javascript)|application/([\w.+-]*\b(json|xml|yaml|openapi|javascript)\b[\w.+-]*))",
+)
+
+
+class GzipCoding:
+    name = "gzip"
+
+    def compressor(self):
+        # wbits 16 + 15 adds gzip header and trailer to the deflate stream
+        compressobj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressobj.compress, lambda: compressobj.flush(zlib.Z_SYNC_FLUSH), compressobj.flush
+
+
+class BrotliCoding:
+    name = "br"
+
+    def compressor(self):
+        compressor = brotli.Compressor(quality=5)
+        return compressor.process, compressor.flush, compressor.finish
+
+
+class ZstdCoding:
+    name = "zstd"
+
+    def compressor(self):
+        compressobj = zstandard.ZstdCompressor(level=3).compressobj()
+        return (
+            compressobj.compress,
+            lambda: compressobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressobj.flush,
+        )
+
+
+# Ordered by preference of the server
+CODINGS = [
+    coding
+    for coding, available in (
+        (ZstdCoding(), zstandard is not None),
+        (BrotliCoding(), brotli is not None),
+        (GzipCoding(), True),
+    )
+    if available
+]
+
+
+def get_coding(accept_encoding: str):
+    """Return preferred coding accepted by `Accept-Encoding`, None if none.
+
+    Codings of the highest quality are accepted, ties are resolved by
+    preference of the server.
+
+    """
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                continue
+        qualities[name.strip()] = quality
+
+    best_coding, best_quality = None, 0.0
+    for coding in CODINGS:
+        quality = qualities.get(coding.name, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_coding, best_quality = coding, quality
+    return best_coding
+
+
+def compress(coding, content: bytes) -> bytes:
+    compress_chunk, _, finish = coding.compressor()
+    return compress_chunk(content) + finish()
+
+
+def compress_sequence(coding, chunks):
+    """Compress chunks of streaming response as they are produced.
+
+    Every chunk is flushed, so client receives data without waiting for
+    the rest of the stream.
+
+    """
+    compress_chunk, flush, finish = coding.compressor()
+    for chunk in chunks:
+        data = compress_chunk(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_sequence(coding, chunks):
+    compress_chunk, flush, finish = coding.compressor()
+    async for chunk in chunks:
+        data = compress_chunk(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """Compress responses by gzip, brotli or zstd.
+
+    Bodies shorter than `COMPRESSION_MIN_SIZE` are sent as is. Streaming
+    responses are compressed chunk by chunk.
+
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.has_header("Content-Encoding")
+            or not COMPRESSIBLE_CONTENT_TYPE_RE.match(response.get("Content-Type", ""))
+            or (not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE)
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = get_coding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(coding, response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(coding, response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            response.content = self.get_compressed_content(request, response, coding)
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # Compressed body is another representation, ETag stays valid only
+        # for weak comparison of conditional requests
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding.name
+        return response
+
+    def get_compressed_content(self, request, response, coding) -> bytes:
+        key = self.get_cache_key(request, response, coding)
+        if key is None:
+            return compress(coding, response.content)
+        cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+        content = cache.get(key)
+        if content is None:
+            content = compress(coding, response.content)
+            cache.set(key, content, settings.COMPRESSION_CACHE_TIMEOUT)
+        return content
+
+    def get_cache_key(self, request, response, coding) -> str | None:
+        """Return cache key of compressed body, None if it is not cached."""
+        if request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return None
+        if len(response.content) > settings.COMPRESSION_CACHE_MAX_SIZE:
+            return None
+        url_name = request.resolver_match and request.resolver_match.url_name
+        if not (
+            response.has_header("ETag")
+            or url_name in settings.COMPRESSION_CACHED_URL_NAMES
+        ):
+            return None
+        # Body is hashed, not ETag, which may be set by views for the
+        # rows shown while the body depends on more than that
+        digest = hashlib.md5(response.content + response["Content-Type"].encode()).hexdigest()
+        return f"compression:{coding.name}:{digest}"
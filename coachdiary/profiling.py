@@ -0,0 +1,125 @@
+"""Profiling of SQL queries and Python code.
+
+Used as context manager or decorator, e.g. in `shell_plus`:
+
+    with profile(output="fix.prof"):
+        fix_results()
+
+On exit number and time of queries, duplicated queries and slowest
+queries are reported. Queries are duplicated when they differ only by
+parameters, which usually means N+1 queries in a loop. With `output`
+cProfile stats are written to the file too, see them by `python -m pstats`
+or snakeviz. Management commands of the project have `--profile` option,
+see `coachdiary.management.base.ProfiledCommand`.
+
+"""
+import contextlib
+import cProfile
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db import connections
+
+# Lists of placeholders of `IN` lookups have the length of the list
+PLACEHOLDER_LIST_RE = re.compile(r"\((?:%s, )+%s\)")
+NUMBER_RE = re.compile(r"\b\d+\b")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+# Names of savepoints are unique, like "s140241_x12"
+SAVEPOINT_RE = re.compile(r'"s\d+_x\d+"')
+
+
+def normalize_sql(sql: str) -> str:
+    """Return SQL without parameters, so queries of a loop are the same."""
+    sql = STRING_RE.sub("%s", sql)
+    sql = SAVEPOINT_RE.sub("%s", sql)
+    sql = NUMBER_RE.sub("%s", sql)
+    return PLACEHOLDER_LIST_RE.sub("(...)", sql)
+
+
+@dataclass
+class Query:
+    alias: str
+    sql: str
+    duration: float
+
+
+class profile(contextlib.ContextDecorator):
+    """Capture queries of all databases and optionally cProfile stats.
+
+    `top` limits number of duplicated and slowest queries in the report,
+    report is written to `stream`, stderr by default.
+
+    """
+
+    def __init__(self, output=None, stream=None, top=10):
+        self.output = output
+        self.stream = stream
+        self.top = top
+        self.queries: list[Query] = []
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.queries = []
+        self.stack = contextlib.ExitStack()
+        for connection in connections.all():
+            self.stack.enter_context(
+                connection.execute_wrapper(self.get_wrapper(connection.alias)),
+            )
+        self.profiler = cProfile.Profile() if self.output else None
+        self.start_time = time.perf_counter()
+        if self.profiler:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.output)
+        self.duration = time.perf_counter() - self.start_time
+        self.stack.close()
+        self.report()
+        return False
+
+    def get_wrapper(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            start_time = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append(
+                    Query(alias, sql, time.perf_counter() - start_time),
+                )
+
+        return wrapper
+
+    def get_duplicates(self) -> list[tuple[str, int]]:
+        """Return normalized SQL of repeated queries with their numbers."""
+        counts = Counter(normalize_sql(query.sql) for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common(self.top) if count > 1]
+
+    def get_slowest(self) -> list[Query]:
+        return sorted(self.queries, key=lambda query: -query.duration)[:self.top]
+
+    def report(self):
+        stream = self.stream or sys.stderr
+        query_time = sum(query.duration for query in self.queries)
+        lines = [
+            f"{len(self.queries)} queries in {query_time:.3f} s, "
+            f"total time {self.duration:.3f} s",
+        ]
+        duplicates = self.get_duplicates()
+        if duplicates:
+            lines.append("Duplicated queries:")
+            lines.extend(f"  {count} x {sql}" for sql, count in duplicates)
+        if self.queries:
+            lines.append("Slowest queries:")
+            lines.extend(
+                f"  {query.duration:.4f} s [{query.alias}] {query.sql}"
+                for query in self.get_slowest()
+            )
+        if self.output:
+            lines.append(f"cProfile stats are written to {self.output}")
+        stream.write("\n".join(lines) + "\n")
@@ -0,0 +1,73 @@
+"""Detection of N+1 queries by growth of query count with data.
+
+Code is run on a small dataset, then rows are added and it is run again.
+Number of queries of an endpoint must not depend on number of rows it
+returns, so any query repeated more times on the bigger dataset is
+reported with its normalized SQL:
+
+    class StudentTests(QueryGrowthMixin, TestCase):
+        def test_list(self):
+            self.assertNoQueryGrowth(
+                lambda: self.client.get("/api/students/"),
+                grow=lambda: create_students(10),
+            )
+
+All routes of standards API are checked by `check_query_growth` command
+and by `standards.tests.test_query_growth`.
+
+"""
+import io
+from collections import Counter
+from collections.abc import Callable
+
+from .profiling import normalize_sql, profile
+
+
+class QueryGrowthError(AssertionError):
+    pass
+
+
+def capture_queries(func: Callable) -> Counter:
+    """Return numbers of queries made by `func` by their normalized SQL."""
+    with profile(stream=io.StringIO()) as captured:
+        func()
+    return Counter(normalize_sql(query.sql) for query in captured.queries)
+
+
+def get_query_growth(small: Counter, large: Counter) -> list[tuple[str, int, int]]:
+    """Return SQL repeated more times on large dataset than on small one."""
+    return [
+        (sql, small[sql], count)
+        for sql, count in large.items()
+        if count > small[sql]
+    ]
+
+
+def format_query_growth(growth: list[tuple[str, int, int]]) -> str:
+    return "\n".join(
+        f"  {small_count} -> {large_count} x {sql}"
+        for sql, small_count, large_count in growth
+    )
+
+
+def assert_no_query_growth(func: Callable, grow: Callable, label: str = ""):
+    """Fail when `func` makes more queries after `grow` has added rows."""
+    small = capture_queries(func)
+    grow()
+    large = capture_queries(func)
+    growth = get_query_growth(small, large)
+    if growth:
+        raise QueryGrowthError(
+            f"{label or func!r}: {sum(small.values())} -> "
+            f"{sum(large.values())} queries\n{format_query_growth(growth)}",
+        )
+
+
+class QueryGrowthMixin:
+    """Mixin of test cases asserting absence of N+1 queries."""
+
+    def assertNoQueryGrowth(self, func: Callable, grow: Callable, msg: str = ""):
+        try:
+            assert_no_query_growth(func, grow, msg)
+        except QueryGrowthError as error:
+            raise self.failureException(str(error)) from None
@@ -0,0 +1,38 @@
+import importlib.util
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+
+# Cost parameters of the hashers from `auth.users.hashers`. Stored hashes made
+# with other parameters (or by other hasher) are transparently rehashed on the
+# next successful login.
+PASSWORD_HASHER_PARAMS = {
+    "argon2": {
+        "time_cost": 2,
+        "memory_cost": 19 * 1024,
+        "parallelism": 1,
+    },
+    "scrypt": {
+        "work_factor": 2 ** 14,
+        "block_size": 8,
+        "parallelism": 1,
+    },
+}
+
+PASSWORD_HASHERS = [
+    "auth.users.hashers.ScryptPasswordHasher",
+    "auth.users.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+# `argon2-cffi` is optional, Argon2 is preferred only when it is installed
+if importlib.util.find_spec("argon2") is not None:
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+# Stateless signed tokens, see `auth.users.tokens`
+TOKEN_AUTH = {
+    "MAX_AGE": 60 * 60 * 24 * 7,
+    # Token version of a user is cached for this number of seconds, so tokens
+    # revoked in another process stop working after this delay at most
+    "VERSION_CACHE_TIMEOUT": 60,
+}
@@ -0,0 +1,38 @@
+import os
+
+from .general import BASE_DIR
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Sessions must be shared by all worker processes of the host, so they
+    # are kept in files instead of memory of a single process. Directory is
+    # created private to the user of the server.
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "SESSION_CACHE_DIR",
+            BASE_DIR.parent / "var" / "cache" / "sessions",
+        ),
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+        },
+    },
+}
+
+# Sessions
+# https://docs.djangoproject.com/en/5.0/topics/http/sessions/
+
+# Sessions are read from cache and written through to the database, expired
+# ones are removed by `clear_expired_sessions` command
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+
+# Number of seconds ids of coach's classes and students are cached for, see
+# `standards.scope.OwnerScope`. Changes are seen at once through the version
+# kept in database, the timeout only limits memory of outdated versions.
+OWNER_SCOPE_CACHE_TIMEOUT = 300
@@ -1,2 +1,7 @@
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
+
+# Imported into `shell_plus`, e.g. `with profile(): ...`
+SHELL_PLUS_IMPORTS = [
+    "from coachdiary.profiling import profile",
+]
@@ -1,5 +1,6 @@
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'coachdiary.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -8,3 +9,11 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+
+# Compression of responses, see `coachdiary.middleware`
+COMPRESSION_MIN_SIZE = 1024
+# Compressed bodies of responses with ETag and of these views are cached
+COMPRESSION_CACHED_URL_NAMES = ("schema",)
+COMPRESSION_CACHE_ALIAS = "default"
+COMPRESSION_CACHE_TIMEOUT = 60 * 60
+COMPRESSION_CACHE_MAX_SIZE = 4 * 1024 * 1024
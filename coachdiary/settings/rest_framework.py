@@ -1,9 +1,24 @@
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
+        'auth.users.api.authentication.SignedTokenAuthentication',
+    ],
+    # JSON is rendered and parsed by `orjson` when it is installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'coachdiary.api.utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'coachdiary.api.utils.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'EXCEPTION_HANDLER': (
         'coachdiary.api.utils.exception_handler.custom_exception_handler'
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_email': '5/min',
+    },
 }
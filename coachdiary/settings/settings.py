@@ -1,4 +1,6 @@
 from .apps import *  # noqa
+from .auth import *  # noqa
+from .cache import *  # noqa
 from .debug import *  # noqa
 from .general import *  # noqa
 from .language import *  # noqa
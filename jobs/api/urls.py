@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework import routers
+
+from . import views
+
+jobs_router = routers.DefaultRouter()
+jobs_router.register(r"jobs", views.JobViewSet, basename="jobs")
+
+urlpatterns = [
+    path("", include(jobs_router.urls)),
+]
@@ -0,0 +1,21 @@
+from rest_framework import mixins, permissions, viewsets
+
+from . import serializers
+from .. import models
+
+
+class JobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Jobs of current user, polled to track progress of heavy operations."""
+    serializer_class = serializers.JobSerializer
+    permission_classes = (
+        permissions.IsAuthenticated,
+    )
+
+    def get_queryset(self):
+        return models.Job.objects.filter(
+            owner_id=self.request.user.id,
+        ).order_by("-created_at")
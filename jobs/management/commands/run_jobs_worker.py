@@ -0,0 +1,98 @@
+import datetime
+import logging
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.db import connections
+from django.utils import timezone
+
+from coachdiary.management.base import ProfiledCommand
+from jobs.models import Job
+from jobs.registry import run_job
+
+logger = logging.getLogger(__name__)
+
+
+class Command(ProfiledCommand):
+    help = "Execute pending jobs in a pool of processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=2,
+            help="Number of jobs executed at the same time",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds between checks for new jobs",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there are no pending jobs",
+        )
+        parser.add_argument(
+            "--stale-timeout",
+            type=float,
+            default=3600,
+            help=(
+                "Seconds after which a running job is considered left by a "
+                "crashed worker and is queued again on start"
+            ),
+        )
+
+    def handle(self, *args, processes, poll_interval, once, stale_timeout, **kwargs):
+        requeued_count = Job.objects.requeue_stale(
+            timezone.now() - datetime.timedelta(seconds=stale_timeout),
+        )
+        if requeued_count:
+            self.stdout.write(f"Requeued {requeued_count} stale jobs")
+
+        running = {}
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as pool:
+            while True:
+                is_claimed = False
+                while len(running) < processes:
+                    job = Job.objects.claim_next()
+                    if job is None:
+                        break
+                    is_claimed = True
+                    self.stdout.write(f"Started {job}")
+                    running[pool.submit(run_job, job.pk)] = job
+
+                if once and not running and not is_claimed:
+                    break
+
+                if running:
+                    done, _ = wait(
+                        running,
+                        timeout=poll_interval,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        self.check_future(future, running.pop(future))
+                else:
+                    connections.close_all()
+                    time.sleep(poll_interval)
+
+    def check_future(self, future, job):
+        """Fail the job when its process failed outside of `run_job`."""
+        error = future.exception()
+        if error is None:
+            return
+        logger.error("Worker of job %s failed", job, exc_info=error)
+        Job.objects.filter(pk=job.pk, status=Job.Status.running).update(
+            status=Job.Status.failed,
+            error="".join(traceback.format_exception(error)),
+            finished_at=timezone.now(),
+        )
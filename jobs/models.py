@@ -0,0 +1,119 @@
+from django.db import models
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+
+    def claim_next(self) -> "Job | None":
+        """Mark the oldest pending job as running and return it.
+
+        Job is claimed by conditional update, so concurrent workers never get
+        the same job even without row locks (which SQLite lacks).
+
+        """
+        pending_ids = self.filter(
+            status=Job.Status.pending,
+        ).order_by("created_at").values_list("id", flat=True)[:10]
+
+        for job_id in pending_ids:
+            is_claimed = self.filter(
+                pk=job_id,
+                status=Job.Status.pending,
+            ).update(
+                status=Job.Status.running,
+                started_at=timezone.now(),
+            )
+            if is_claimed:
+                return self.get(pk=job_id)
+        return None
+
+    def requeue_stale(self, started_before) -> int:
+        """Return jobs left running by a crashed worker to the queue.
+
+        Jobs are stale when they were started before `started_before`, so
+        jobs of other workers still running are not taken.
+
+        """
+        return self.filter(
+            status=Job.Status.running,
+            started_at__lt=started_before,
+        ).update(
+            status=Job.Status.pending,
+            progress=0,
+            started_at=None,
+        )
+
+
+class Job(models.Model):
+    """Heavy operation executed by `run_jobs_worker` outside of requests."""
+
+    class Status(models.TextChoices):
+        pending = "pending", "Ожидает выполнения"
+        running = "running", "Выполняется"
+        succeeded = "succeeded", "Выполнена"
+        failed = "failed", "Завершилась с ошибкой"
+
+    name = models.CharField(
+        max_length=255,
+        verbose_name="Название обработчика задачи",
+    )
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Параметры задачи",
+    )
+    owner = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs",
+        verbose_name="Кто запустил задачу",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.pending,
+        verbose_name="Статус",
+    )
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Прогресс, %",
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Результат",
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Ошибка",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = (
+            models.Index(fields=("status", "created_at")),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    def set_progress(self, progress: int):
+        """Store progress in percents without touching other fields."""
+        self.progress = progress
+        Job.objects.filter(pk=self.pk).update(progress=progress)
@@ -0,0 +1,57 @@
+import logging
+import traceback
+from typing import Callable
+
+from django.db import connections
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS: dict[str, Callable] = {}
+
+
+def register(name: str):
+    """Register function as handler of jobs with the given name.
+
+    Handler is called as `handler(job, **job.params)`, may report progress by
+    `job.set_progress()` and returns JSON serializable result.
+
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        HANDLERS[name] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue(name: str, owner=None, **params) -> Job:
+    """Create pending job, it is executed by `run_jobs_worker` command."""
+    if name not in HANDLERS:
+        raise ValueError(f"Job handler '{name}' is not registered.")
+    return Job.objects.create(name=name, owner=owner, params=params)
+
+
+def run_job(job_id: int):
+    """Execute claimed job and store its result or error."""
+    job = Job.objects.get(pk=job_id)
+    try:
+        result = HANDLERS[job.name](job, **job.params)
+    except Exception:
+        logger.exception("Job %s failed", job)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.failed,
+            error=traceback.format_exc(),
+            finished_at=timezone.now(),
+        )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.succeeded,
+            progress=100,
+            result=result,
+            finished_at=timezone.now(),
+        )
+    finally:
+        connections.close_all()
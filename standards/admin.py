@@ -1 +1,231 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from . import models
+from .deletion import soft_delete_classes, soft_delete_students
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator which does not count all rows of big tables.
+
+    Rows are counted exactly up to `exact_count_limit`, above it the count
+    is taken from table statistics of the database.
+
+    """
+    exact_count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        count = self.object_list[:self.exact_count_limit + 1].count()
+        if count <= self.exact_count_limit:
+            return count
+        return max(count, self.get_estimated_count())
+
+    def get_estimated_count(self):
+        table = self.object_list.model._meta.db_table
+        connection = connections[self.object_list.db]
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [table],
+                )
+            elif connection.vendor == "sqlite":
+                # Statistics are collected by ANALYZE, first number of
+                # stat of an index is number of rows in the table
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'",
+                )
+                if cursor.fetchone() is None:
+                    return 0
+                cursor.execute(
+                    "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 "
+                    "WHERE tbl = %s",
+                    [table],
+                )
+            else:
+                return 0
+            row = cursor.fetchone()
+        return (row and row[0]) or 0
+
+
+class GradeListFilter(admin.SimpleListFilter):
+    """Filter by grade with fixed choices.
+
+    Filter of a field lists its distinct values, which reads whole table of
+    results on every page of the list.
+
+    """
+    title = "Оценка"
+    parameter_name = "grade"
+
+    def lookups(self, request, model_admin):
+        return [(str(grade), str(grade)) for grade in (5, 4, 3, 2)]
+
+    def queryset(self, request, queryset):
+        if self.value() is not None:
+            return queryset.filter(grade=self.value())
+        return queryset
+
+
+class BigTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    ordering = (
+        "-id",
+    )
+
+
+@admin.register(models.StudentClass)
+class StudentClassAdmin(BigTableAdmin):
+    list_display = (
+        "id",
+        "__str__",
+        "recruitment_year",
+        "class_owner",
+    )
+    list_select_related = (
+        "class_owner",
+    )
+    list_filter = (
+        "number",
+    )
+    search_fields = (
+        "^class_owner__email",
+    )
+    autocomplete_fields = (
+        "class_owner",
+    )
+    ordering = (
+        "number",
+        "class_name",
+    )
+
+    def delete_model(self, request, obj):
+        soft_delete_classes(models.StudentClass.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_classes(queryset)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Classes are looked up by their name, like "4А"
+        number, class_name = search_term[:-1].strip(), search_term[-1:].upper()
+        if number.isdigit() and class_name.isalpha():
+            return queryset.filter(number=number, class_name=class_name), False
+        if search_term.strip().isdigit():
+            return queryset.filter(number=search_term.strip()), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(models.Student)
+class StudentAdmin(BigTableAdmin):
+    list_display = (
+        "id",
+        "full_name",
+        "student_class",
+        "birthday",
+        "gender",
+    )
+    list_select_related = (
+        "student_class",
+    )
+    list_filter = (
+        "gender",
+    )
+    search_fields = (
+        "^full_name",
+    )
+    autocomplete_fields = (
+        "student_class",
+    )
+
+    def get_queryset(self, request):
+        # Class is a part of student's name in autocomplete results too
+        return super().get_queryset(request).select_related("student_class")
+
+    def delete_model(self, request, obj):
+        soft_delete_students(models.Student.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_students(queryset)
+
+
+@admin.register(models.Standard)
+class StandardAdmin(BigTableAdmin):
+    list_display = (
+        "id",
+        "name",
+        "has_numeric_value",
+        "who_added",
+    )
+    list_select_related = (
+        "who_added",
+    )
+    list_filter = (
+        "has_numeric_value",
+        "is_template",
+    )
+    search_fields = (
+        "^name",
+    )
+    autocomplete_fields = (
+        "who_added",
+    )
+
+
+@admin.register(models.Level)
+class LevelAdmin(BigTableAdmin):
+    list_display = (
+        "id",
+        "standard",
+        "level_number",
+        "gender",
+        "low_level_value",
+        "middle_level_value",
+        "high_level_value",
+    )
+    list_select_related = (
+        "standard",
+    )
+    list_filter = (
+        "gender",
+        "level_number",
+    )
+    search_fields = (
+        "^standard__name",
+    )
+    autocomplete_fields = (
+        "standard",
+    )
+
+
+@admin.register(models.StudentStandard)
+class StudentStandardAdmin(BigTableAdmin):
+    list_display = (
+        "id",
+        "student",
+        "standard",
+        "value",
+        "grade",
+        "level",
+    )
+    # Student is shown with the class
+    list_select_related = (
+        "student__student_class",
+        "standard",
+        "level",
+    )
+    list_filter = (
+        GradeListFilter,
+    )
+    search_fields = (
+        "^student__full_name",
+    )
+    autocomplete_fields = (
+        "student",
+        "standard",
+        "level",
+    )
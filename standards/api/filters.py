@@ -1,7 +1,7 @@
 from django_filters import rest_framework as filters
-from django.db.models.functions import ExtractYear
+from django.db.models import Q
 from ..models import Student, StudentClass
-from datetime import datetime
+from datetime import date, datetime
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -19,33 +19,40 @@ class StudentFilter(filters.FilterSet):
         year_validator = [MinValueValidator(2000), MaxValueValidator(datetime.now().year)]
         for validator in year_validator:
             validator(value)
-        return queryset.annotate(year=ExtractYear('birthday')).filter(year__gte=value)
+        # Compare with date bounds instead of extracted year, so index on
+        # birthday can be used
+        return queryset.filter(birthday__gte=date(int(value), 1, 1))
 
     def filter_by_year_lte(self, queryset, name, value):
-        return queryset.annotate(year=ExtractYear('birthday')).filter(year__lte=value)
+        year = min(max(int(value), date.min.year), date.max.year)
+        return queryset.filter(birthday__lte=date(year, 12, 31))
 
     def filter_by_class(self, queryset, name, value):
         """
         Custom filter method to handle class filtering.
         Supports filtering by multiple specific classes (e.g., "4А,2А") or by multiple grades (e.g., "4,2").
+        Classes are resolved to ids first, so students are filtered
+        without joining the classes table.
         """
         # Split the input value into a list of classes/grades
         class_values = value.split(',')
 
         # Initialize the Q object to hold the OR conditions
-        from django.db.models import Q
         query = Q()
 
         for class_value in class_values:
             class_value = class_value.strip()
             if class_value[-1].isdigit():
                 # Filtering by grade
-                query |= Q(student_class__number=class_value)
+                query |= Q(number=class_value)
             else:
                 # Filtering by specific class
                 number = class_value[:-1]
                 class_name = class_value[-1].upper()
-                query |= Q(student_class__number=number, student_class__class_name=class_name)
+                query |= Q(number=number, class_name=class_name)
 
-        # Filter the queryset based on the constructed Q object
-        return queryset.filter(query)
\ No newline at end of file
+        class_ids = StudentClass.objects.filter(
+            query,
+            class_owner=self.request.user,
+        ).values_list("id", flat=True)
+        return queryset.filter(student_class_id__in=list(class_ids))
@@ -1,3 +1,7 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import serializers, exceptions
 from rest_framework.exceptions import ValidationError
 
@@ -6,9 +10,13 @@ from coachdiary.api.utils.serializers import get_id_serializer_for_model
 from drf_writable_nested.serializers import WritableNestedModelSerializer
 
 from .. import models
+from ..scope import get_owner_scope
 
 
 class LevelSerializer(serializers.ModelSerializer):
+    # Id of an existing level is accepted on update of a standard
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = models.Level
         fields = (
@@ -19,9 +27,6 @@ class LevelSerializer(serializers.ModelSerializer):
             "high_level_value",
             "gender"
         )
-        read_only_fields = (
-            "id",
-        )
 
 
 # class StandardValueSerializer(WritableNestedModelSerializer):
@@ -118,9 +123,18 @@ class FullClassNameSerializer(serializers.ModelSerializer):
 class StandardSerializer(serializers.ModelSerializer):
     levels = LevelSerializer(many=True)
 
+    level_fields = (
+        "level_number",
+        "low_level_value",
+        "middle_level_value",
+        "high_level_value",
+        "gender",
+    )
+
     class Meta:
         model = models.Standard
-        fields = ['id', 'name', 'has_numeric_value', 'levels']
+        fields = ['id', 'name', 'has_numeric_value', 'is_template', 'source', 'levels']
+        read_only_fields = ['source']
 
     def validate(self, attrs):
         if "has_numeric_value" in attrs:
@@ -156,41 +170,96 @@ class StandardSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         levels_data = validated_data.pop("levels", [])
         request_user = self.context['request'].user
-        standard = models.Standard.objects.create(who_added=request_user, **validated_data)
-
-        for single_level_data in levels_data:
-            models.Level.objects.create(standard=standard, **single_level_data)
+        with transaction.atomic():
+            standard = models.Standard.objects.create(who_added=request_user, **validated_data)
+            self.write_levels(standard, levels_data)
 
         return standard
 
     def update(self, instance, validated_data):
-        levels_data = validated_data.pop('levels', [])
+        # Levels are kept as is by partial update without them
+        levels_data = validated_data.pop('levels', None)
         instance.name = validated_data.get('name', instance.name)
         instance.has_numeric_value = validated_data.get('has_numeric_value', instance.has_numeric_value)
-        instance.save()
+        instance.is_template = validated_data.get('is_template', instance.is_template)
+        with transaction.atomic():
+            instance.save()
+            if levels_data is not None:
+                self.write_levels(instance, levels_data)
 
-        existing_levels = {level.id: level for level in instance.levels.all()}
-        new_levels = []
+        return instance
 
-        for single_level_data in levels_data:
-            level_id = single_level_data.get('id')
-            if level_id and level_id in existing_levels:
-                level = existing_levels.pop(level_id)
-                level.level_number = single_level_data.get('level_number', level.level_number)
-                level.low_level_value = single_level_data.get('low_level_value', level.low_level_value)
-                level.middle_level_value = single_level_data.get('middle_level_value', level.middle_level_value)
-                level.high_level_value = single_level_data.get('high_level_value', level.high_level_value)
-                level.gender = single_level_data.get('gender', level.gender)
-                level.save()
-            else:
-                new_levels.append(models.Level(standard=instance, **single_level_data))
+    def write_levels(self, standard, levels_data):
+        """Make levels of the standard match `levels_data`.
 
-        for level in existing_levels.values():
-            level.delete()
+        Level is matched by id or, when id is not given, by level number
+        and gender. Changes are computed in memory and written with one
+        query per kind: update, insert and delete.
 
-        models.Level.objects.bulk_create(new_levels)
+        Levels of a template with subscribers are not removed, as results
+        of their students are graded by them. Results on removed levels
+        are kept and unlinked from them.
 
-        return instance
+        """
+        existing_levels = list(standard.levels.all())
+        levels_by_id = {level.id: level for level in existing_levels}
+        levels_by_key = {(level.level_number, level.gender): level for level in existing_levels}
+
+        new_levels = []
+        changed_levels = []
+        changed_fields = set()
+        for single_level_data in levels_data:
+            level = levels_by_id.get(single_level_data.get('id')) or levels_by_key.get(
+                (single_level_data.get('level_number'), single_level_data.get('gender')),
+            )
+            if level is None:
+                level = models.Level(standard=standard)
+                new_levels.append(level)
+            else:
+                levels_by_id.pop(level.id)
+                levels_by_key.pop((level.level_number, level.gender), None)
+
+            level_changed_fields = {
+                field for field in self.level_fields
+                if field in single_level_data and getattr(level, field) != single_level_data[field]
+            }
+            for field in level_changed_fields:
+                setattr(level, field, single_level_data[field])
+            if level.pk and level_changed_fields:
+                changed_levels.append(level)
+                changed_fields |= level_changed_fields
+
+        # Kept levels are checked in memory once, as bulk queries do not
+        # call `Level.save()`. Standard of the levels is already cached.
+        kept_levels = [level for level in existing_levels if level.id not in levels_by_id]
+        for level in kept_levels + new_levels:
+            try:
+                level.clean()
+            except DjangoValidationError as error:
+                raise serializers.ValidationError({"levels": error.messages})
+        if levels_by_id and standard.subscriptions.exists():
+            raise serializers.ValidationError({
+                "levels": ["Levels of a standard used by other coaches as a template can not be removed."],
+            })
+
+        now = timezone.now()
+        if changed_levels:
+            for level in changed_levels:
+                level.updated_at = now
+            models.Level.objects.bulk_update(changed_levels, [*sorted(changed_fields), "updated_at"])
+        if new_levels:
+            models.Level.objects.bulk_create(new_levels)
+        if levels_by_id:
+            # Deleted level would delete its results by cascade
+            models.StudentStandard.global_objects.filter(
+                level_id__in=levels_by_id,
+            ).update(level=None, updated_at=now)
+            models.Level.objects.filter(id__in=levels_by_id).delete()
+
+        # Results are linked to level by class number and gender, so links
+        # are refreshed only when these have changed
+        if new_levels or changed_fields & {"level_number", "gender"}:
+            models.StudentStandard.objects.filter(standard=standard).relink_levels()
 
 
 class StudentStandardSerializer(serializers.ModelSerializer):
@@ -205,12 +274,55 @@ class StudentStandardSerializer(serializers.ModelSerializer):
             'level')
 
 
+STUDENT_VALUE_FIELDS = ("id", "full_name", "student_class_id", "birthday", "gender")
+
+
+def serialize_students(rows) -> list[dict]:
+    """Return output of `StudentSerializer` for rows of `.values()`.
+
+    Rows have `STUDENT_VALUE_FIELDS`, other keys of a row are added after
+    the student's fields. Classes are read by one query and shared by
+    their students.
+
+    """
+    rows = list(rows)
+    classes = {
+        student_class["id"]: student_class
+        for student_class in models.StudentClass.global_objects.filter(
+            id__in={row["student_class_id"] for row in rows},
+        ).values("id", "class_name", "number", "recruitment_year")
+    }
+
+    data = []
+    for row in rows:
+        birthday = row.pop("birthday")
+        data.append({
+            "id": row.pop("id"),
+            "full_name": row.pop("full_name"),
+            "student_class": classes.get(row.pop("student_class_id")),
+            "birthday": birthday and birthday.isoformat(),
+            "gender": row.pop("gender"),
+            **row,
+        })
+    return data
+
+
+class StudentListSerializer(serializers.ListSerializer):
+    """Read students of a queryset without building model instances."""
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet):
+            return serialize_students(data.values(*STUDENT_VALUE_FIELDS))
+        return super().to_representation(data)
+
+
 class StudentSerializer(WritableNestedModelSerializer):
     student_class = StudentClassSerializer()
 
     class Meta:
         model = models.Student
         fields = ("id", "full_name", "student_class", "birthday", "gender")
+        list_serializer_class = StudentListSerializer
 
     def create(self, validated_data):
         student_class_data = validated_data.pop('student_class')
@@ -253,6 +365,36 @@ class StudentSerializer(WritableNestedModelSerializer):
         return class_instance
 
 
+class StudentIdsSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class StudentTransferSerializer(StudentIdsSerializer):
+    class_id = serializers.IntegerField()
+
+
+class ClassIdsSerializer(serializers.Serializer):
+    class_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class ProgressQuerySerializer(serializers.Serializer):
+    student_id = serializers.IntegerField(required=False)
+    class_id = serializers.IntegerField(required=False)
+    bucket = serializers.ChoiceField(choices=models.StudentStandardAttempt.BUCKETS, default="month")
+    aggregate = serializers.ChoiceField(choices=models.StudentStandardAttempt.AGGREGATES, default="mean")
+    school_year = serializers.IntegerField(required=False, min_value=1, max_value=32767)
+
+    def validate(self, attrs):
+        if ("student_id" in attrs) == ("class_id" in attrs):
+            raise serializers.ValidationError("Either student_id or class_id is required.")
+        return attrs
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    limit = serializers.IntegerField(default=20)
+
+
 class StudentResultSerializer(serializers.ModelSerializer):
     student_class = FullClassNameSerializer()
     student_standards = StudentStandardSerializer(source='studentstandard_set', many=True)
@@ -296,13 +438,18 @@ class StudentStandardCreateSerializer(serializers.ModelSerializer):
         level_id = data.get('level_id')
         level_number = data.get('level_number')
 
+        if student_id not in get_owner_scope(self.context['request']).student_ids:
+            raise serializers.ValidationError("Student does not exist")
+
         try:
             student = models.Student.objects.get(id=student_id)
         except models.Student.DoesNotExist:
             raise serializers.ValidationError("Student does not exist")
 
         try:
-            standard = models.Standard.objects.get(id=standard_id)
+            standard = models.Standard.objects.available_to(
+                self.context['request'].user,
+            ).get(id=standard_id)
         except models.Standard.DoesNotExist:
             raise serializers.ValidationError("Standard does not exist")
 
@@ -327,7 +474,6 @@ class StudentStandardCreateSerializer(serializers.ModelSerializer):
                         gender=student.gender
                     )
                     level_id = level.id
-                    print(level.level_number)
                 except models.Level.DoesNotExist:
                     raise serializers.ValidationError("Invalid level for the student's class")
 
@@ -8,6 +8,7 @@ standards_router = routers.DefaultRouter()
 standards_router.register(r"standards", views.StandardValueViewSet, basename="students-standards")
 standards_router.register(r"students", views.StudentViewSet, basename="students")
 standards_router.register(r"classes", views.StudentClassViewset, basename="classes")
+standards_router.register(r"sync", views.SyncViewSet, basename="sync")
 standards_router.register(r"students/(?P<student_id>\d+)/standards", views.StudentStandardsViewSet,
                           basename="student-standards")
 standards_router.register(r'students/results', StudentsResultsViewSet, basename='students-results')
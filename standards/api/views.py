@@ -1,17 +1,41 @@
+import datetime
+
 from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import mixins, viewsets, permissions, status
+from rest_framework import serializers as drf_serializers
 from django_filters import rest_framework as filters
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from coachdiary.api.utils.conditional import (
+    ConditionalGetMixin,
+    get_fingerprint,
+    get_not_modified_response,
+    set_conditional_headers,
+)
+from coachdiary.api.utils.renderers import ColumnarJSONRenderer
+from jobs.api.serializers import JobSerializer
+from jobs.models import Job
+from jobs.registry import enqueue
 
 from . import serializers
 from . import filters as custom_filters
-from .serializers import StudentStandardSerializer, StudentSerializer, StudentResultSerializer
-from .. import models
+from .serializers import StudentStandardSerializer, StudentResultSerializer
+from .. import models, sharing, sync
+from ..deletion import restore_classes, restore_students, soft_delete_classes, soft_delete_students
+from ..rollover import RolloverError, check_rollover
+from ..school_year import get_term_start
+from ..scope import get_owner_scope
+from ..search import search_students
+from ..transfer import transfer_students
 
 
 class StandardValueViewSet(
+    ConditionalGetMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
     mixins.ListModelMixin,
@@ -23,16 +47,114 @@ class StandardValueViewSet(
     permission_classes = (
         permissions.IsAuthenticated,
     )
+    conditional_fields = ('updated_at', 'levels__updated_at')
 
     def get_queryset(self):
         user = self.request.user
-        return models.Standard.objects.filter(who_added_id=user.id)
+        return models.Standard.objects.available_to(user).prefetch_related('levels')
 
     def perform_create(self, serializer):
         serializer.save(who_added_id=self.request.user.id)
 
+    def perform_update(self, serializer):
+        # Template of another coach is copied on the first change
+        if serializer.instance.who_added_id != self.request.user.id:
+            serializer.instance = sharing.fork_standard(serializer.instance, self.request.user)
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        if instance.who_added_id != self.request.user.id:
+            raise PermissionDenied("Only the author can delete the standard, unsubscribe instead.")
+        if instance.subscriptions.exists():
+            raise ValidationError({"error": "Standard is used by other coaches as a template."})
+        instance.delete()
+
+    def get_template(self, pk):
+        return get_object_or_404(models.Standard, pk=pk, is_template=True)
+
+    @action(detail=False, methods=['get'])
+    def templates(self, request):
+        """Return templates shared by coaches, available for subscription."""
+        queryset = models.Standard.objects.filter(
+            is_template=True,
+        ).prefetch_related('levels').order_by('name', 'id')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def subscribe(self, request, pk=None):
+        template = self.get_template(pk)
+        if template.who_added_id == request.user.id:
+            return Response({"error": "Standard is already yours."}, status=status.HTTP_400_BAD_REQUEST)
+        created = sharing.subscribe(request.user, template)
+        return Response(
+            self.get_serializer(template).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['post'])
+    def unsubscribe(self, request, pk=None):
+        template = self.get_template(pk)
+        if not sharing.unsubscribe(request.user, template):
+            return Response({"error": "Not subscribed to the standard."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """Return progress series of a student or a class for the standard.
+
+        Attempts are bucketed by `bucket` (week, month, term) and aggregated
+        by `aggregate` (mean, best, last) in database, so response size
+        depends on number of buckets only.
+
+        """
+        standard = self.get_object()
+        query_serializer = serializers.ProgressQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        student_id = query_serializer.validated_data.get('student_id')
+        class_id = query_serializer.validated_data.get('class_id')
+        bucket = query_serializer.validated_data['bucket']
+        aggregate = query_serializer.validated_data['aggregate']
+        school_year = query_serializer.validated_data.get('school_year')
+
+        scope = get_owner_scope(request)
+        attempts = models.StudentStandardAttempt.objects.filter(standard=standard)
+        if student_id is not None:
+            if student_id not in scope.student_ids:
+                raise PermissionDenied("You do not have permission to access this student's results.")
+            attempts = attempts.filter(student_id=student_id)
+        else:
+            if class_id not in scope.class_ids:
+                raise PermissionDenied("You do not have permission to access this class.")
+            attempts = attempts.filter(
+                student__in=models.Student.objects.filter(student_class_id=class_id),
+            )
+        if school_year is not None:
+            attempts = attempts.for_school_year(school_year)
+
+        points = []
+        for row in attempts.bucketed(bucket, aggregate):
+            if bucket == 'term':
+                start = get_term_start(row['school_year'], row['term'])
+            else:
+                start = timezone.localdate(row['bucket_start'])
+            points.append({
+                "start": start,
+                "value": row['aggregated_value'],
+                "count": row['count'],
+            })
+
+        return Response({
+            "bucket": bucket,
+            "aggregate": aggregate,
+            "points": points,
+        })
+
 
 class StudentViewSet(
+    ConditionalGetMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
     mixins.ListModelMixin,
@@ -42,13 +164,90 @@ class StudentViewSet(
 ):
     serializer_class = serializers.StudentSerializer
     queryset = models.Student.objects.all()
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer)
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = custom_filters.StudentFilter
     permission_classes = (permissions.IsAuthenticated,)
+    conditional_fields = ('updated_at', 'student_class__updated_at')
 
     def get_queryset(self):
-        user = self.request.user
-        return models.Student.objects.filter(student_class__class_owner=user)
+        scope = get_owner_scope(self.request)
+        return models.Student.objects.filter(student_class_id__in=scope.class_ids)
+
+    def perform_destroy(self, instance):
+        soft_delete_students(models.Student.objects.filter(pk=instance.pk))
+
+    def get_student_ids(self, request) -> set[int]:
+        serializer = serializers.StudentIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return set(serializer.validated_data['student_ids'])
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Soft delete students with `student_ids` and their results."""
+        student_ids = self.get_student_ids(request)
+        if not student_ids <= get_owner_scope(request).student_ids:
+            raise PermissionDenied("You do not have permission to access these students.")
+        counts = soft_delete_students(models.Student.objects.filter(id__in=student_ids))
+        return Response(counts, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def restore(self, request):
+        """Restore deleted students with `student_ids` and their results.
+
+        Students of deleted classes are restored with their class only.
+
+        """
+        student_ids = self.get_student_ids(request)
+        students = models.Student.deleted_objects.filter(
+            id__in=student_ids,
+            student_class__class_owner=request.user,
+        )
+        if len(student_ids) != students.count():
+            raise PermissionDenied("You do not have permission to access these students.")
+        return Response(restore_students(students), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Return students whose full name best matches `q`.
+
+        Matches by parts of words and tolerates typos. Filters of the list
+        are applied too, `limit` (default 20, at most 100) caps results.
+
+        """
+        query_serializer = serializers.SearchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data['q']
+        limit = min(max(query_serializer.validated_data['limit'], 1), 100)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        students = search_students(queryset, query, limit)
+        serializer = self.get_serializer(students, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def transfer(self, request):
+        """Move students with `student_ids` to the class with `class_id`.
+
+        Results of the students are re-linked to levels of the new class.
+
+        """
+        serializer = serializers.StudentTransferSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        student_ids = set(serializer.validated_data['student_ids'])
+        class_id = serializer.validated_data['class_id']
+
+        scope = get_owner_scope(request)
+        if class_id not in scope.class_ids:
+            raise PermissionDenied("You do not have permission to access this class.")
+        if not student_ids <= scope.student_ids:
+            raise PermissionDenied("You do not have permission to access these students.")
+
+        counts = transfer_students(
+            models.Student.objects.filter(id__in=student_ids),
+            models.StudentClass.objects.get(id=class_id),
+        )
+        return Response(counts, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
     def results(self, request):
@@ -57,38 +256,58 @@ class StudentViewSet(
 
         if not class_ids or not standard_id:
             return Response({"error": "class_id[] and standard_id are required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            class_ids = set(map(int, class_ids))
+            standard_id = int(standard_id)
+        except ValueError:
+            return Response({"error": "class_id[] and standard_id must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
 
         try:
             standard = models.Standard.objects.get(id=standard_id)
         except models.Standard.DoesNotExist:
             return Response({"error": "Standard not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        students = models.Student.objects.filter(student_class__id__in=class_ids,
-                                                 student_class__class_owner=request.user)
+        scope = get_owner_scope(request)
+        students = models.Student.objects.filter(
+            student_class_id__in=scope.class_ids.intersection(class_ids),
+        )
         results = models.StudentStandard.objects.filter(student__in=students, standard=standard)
 
-        response_data = []
-        for result in results:
-            student_data = StudentSerializer(result.student).data
-            result_data = {
-                "value": result.value,
-                "grade": result.grade
+        response_data = serializers.serialize_students(
+            {
+                "id": row["student_id"],
+                "full_name": row["student__full_name"],
+                "student_class_id": row["student__student_class_id"],
+                "birthday": row["student__birthday"],
+                "gender": row["student__gender"],
+                "value": row["value"],
+                "grade": row["grade"],
             }
-            student_data.update(result_data)
-            response_data.append(student_data)
+            for row in results.values(
+                "student_id",
+                *(f"student__{field}" for field in serializers.STUDENT_VALUE_FIELDS[1:]),
+                "value",
+                "grade",
+            )
+        )
 
         return Response(response_data, status=status.HTTP_200_OK)
 
 
 class StudentClassViewset(
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
     serializer_class = serializers.StudentClassSerializer
     permission_classes = (
         permissions.IsAuthenticated,
     )
+    filter_backends = (filters.DjangoFilterBackend,)
+    filterset_fields = ('number', 'recruitment_year')
 
     def get_queryset(self):
         user = self.request.user
@@ -100,17 +319,69 @@ class StudentClassViewset(
             raise PermissionDenied("You do not have permission to access this object.")
         return obj
 
+    def perform_destroy(self, instance):
+        soft_delete_classes(models.StudentClass.objects.filter(pk=instance.pk))
+
+    @action(detail=False, methods=['post'])
+    def restore(self, request):
+        """Restore deleted classes with `class_ids`.
+
+        Students and results deleted with a class are restored with it.
+
+        """
+        serializer = serializers.ClassIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        class_ids = set(serializer.validated_data['class_ids'])
+        classes = models.StudentClass.deleted_objects.filter(
+            id__in=class_ids,
+            class_owner=request.user,
+        )
+        if len(class_ids) != classes.count():
+            raise PermissionDenied("You do not have permission to access these classes.")
+        return Response(restore_classes(classes), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def rollover(self, request):
+        """Promote all classes of the coach to the next school year.
+
+        Classes of the last grade are archived with their students. Made by
+        a background job, poll the returned job for counts of changed rows.
+        Classes are moved once per school year.
+
+        """
+        try:
+            check_rollover(request.user)
+        except RolloverError as error:
+            return Response({"error": str(error)}, status=status.HTTP_409_CONFLICT)
+        if Job.objects.filter(
+            name="rollover_classes",
+            owner=request.user,
+            status__in=(Job.Status.pending, Job.Status.running),
+        ).exists():
+            return Response({"error": "Classes are being moved already."}, status=status.HTTP_409_CONFLICT)
+
+        job = enqueue("rollover_classes", owner=request.user)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
 
 class StudentStandardsViewSet(viewsets.ViewSet):
     permission_classes = (permissions.IsAuthenticated,)
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer)
 
     def list(self, request, student_id=None):
-        try:
-            student = models.Student.objects.get(id=student_id, student_class__class_owner=request.user)
-        except models.Student.DoesNotExist:
+        if int(student_id) not in get_owner_scope(request).student_ids:
             raise PermissionDenied("You do not have permission to access this student's standards.")
 
-        student_standards = models.StudentStandard.objects.filter(student=student)
+        student_standards = models.StudentStandard.objects.filter(student_id=student_id)
+        etag = get_fingerprint(
+            request,
+            student_standards,
+            ('updated_at', 'standard__updated_at', 'level__updated_at'),
+        )
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+        student_standards = student_standards.select_related('standard', 'level')
 
         # Construct the desired output format
         response_data = []
@@ -127,12 +398,44 @@ class StudentStandardsViewSet(viewsets.ViewSet):
             }
             response_data.append(standard_data)
 
+        return set_conditional_headers(Response(response_data), etag)
+
+    @action(detail=False, methods=['get'])
+    def percentiles(self, request, student_id=None):
+        """Return student's percentile among peers for all their standards.
+
+        Peers are students of the same gender graded on the same level number
+        of the standard.
+
+        """
+        if int(student_id) not in get_owner_scope(request).student_ids:
+            raise PermissionDenied("You do not have permission to access this student's standards.")
+
+        student_standards = models.StudentStandard.objects.filter(
+            student_id=student_id,
+        ).with_percentiles().select_related('standard', 'level')
+
+        response_data = [
+            {
+                'standard': {
+                    'id': student_standard.standard.id,
+                    'name': student_standard.standard.name,
+                },
+                'level_number': student_standard.level.level_number if student_standard.level else None,
+                'value': student_standard.value,
+                'grade': student_standard.grade,
+                'percentile': student_standard.percentile,
+                'cohort_size': student_standard.cohort_size,
+            }
+            for student_standard in student_standards
+        ]
         return Response(response_data)
 
 
 class StudentsResultsViewSet(viewsets.GenericViewSet):
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = StudentResultSerializer
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer)
 
     def list(self, request):
         class_ids = request.query_params.getlist('class_id[]')
@@ -141,9 +444,10 @@ class StudentsResultsViewSet(viewsets.GenericViewSet):
         if not class_ids or not standard_id:
             return Response({"detail": "class_id and standard_id are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Get students within the specified classes
+        # Get students within the specified classes of the coach
+        scope = get_owner_scope(request)
         students = models.Student.objects.filter(
-            student_class__id__in=class_ids
+            student_class_id__in=scope.class_ids.intersection(map(int, class_ids)),
         ).prefetch_related(
             'studentstandard_set__standard',
             'studentstandard_set__level_id'
@@ -169,7 +473,7 @@ class StudentResultsCreateOrUpdateViewSet(viewsets.ViewSet):
         errors = []
 
         for entry in data:
-            serializer = serializers.StudentStandardCreateSerializer(data=entry)
+            serializer = serializers.StudentStandardCreateSerializer(data=entry, context={'request': request})
             if serializer.is_valid():
                 validated_data = serializer.validated_data
                 student_id = validated_data['student_id']
@@ -181,7 +485,7 @@ class StudentResultsCreateOrUpdateViewSet(viewsets.ViewSet):
                     )
                     # If it exists, update it
                     update_serializer = serializers.StudentStandardCreateSerializer(
-                        student_result, data=entry, partial=True
+                        student_result, data=entry, partial=True, context={'request': request}
                     )
                     if update_serializer.is_valid():
                         update_serializer.save()
@@ -205,3 +509,103 @@ class StudentResultsCreateOrUpdateViewSet(viewsets.ViewSet):
             return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(response_data, status=status.HTTP_200_OK)
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Delta sync for offline clients, see `standards.sync`."""
+    permission_classes = (permissions.IsAuthenticated,)
+
+    # Results uploaded in one batch at most
+    max_batch_size = 500
+    # Clocks of clients may run ahead of the server by this much
+    max_clock_skew = datetime.timedelta(minutes=5)
+
+    def list(self, request):
+        """Return rows changed since `cursor`, or all rows without it.
+
+        Response includes new `cursor` to pass to the next sync.
+
+        """
+        started_at = timezone.now()
+        cursor = request.query_params.get('cursor')
+        since = None
+        if cursor:
+            try:
+                since = sync.parse_cursor(cursor)
+            except ValueError:
+                return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = sync.get_changes(request.user, since)
+        changes["standards"] = serializers.StandardSerializer(changes["standards"], many=True).data
+        return Response({"cursor": sync.make_cursor(started_at), **changes})
+
+    @action(detail=False, methods=['post'])
+    def results(self, request):
+        """Save results recorded offline.
+
+        Each entry has `student_id`, `standard_id`, `value` and `recorded_at`.
+        Entry recorded later than the latest known attempt becomes current
+        result, an older one is only added to the history of attempts.
+        Repeated uploads of the same entry are ignored, so `recorded_at` is
+        stored as sent, entries recorded in the future are refused. Entries
+        are saved independently, errors are reported per entry.
+
+        """
+        data = request.data
+        if not isinstance(data, list):
+            return Response({"error": "Expected a list of objects."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(data) > self.max_batch_size:
+            return Response({"error": f"At most {self.max_batch_size} results per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        recorded_at_field = drf_serializers.DateTimeField()
+        response_data = []
+        for entry in data:
+            serializer = serializers.StudentStandardCreateSerializer(data=entry, context={'request': request})
+            try:
+                serializer.is_valid(raise_exception=True)
+                recorded_at = recorded_at_field.to_internal_value(entry.get('recorded_at') or now)
+                if recorded_at > now + self.max_clock_skew:
+                    # Future result would stay current over later ones
+                    raise ValidationError({"recorded_at": ["Result can not be recorded in the future."]})
+            except ValidationError as error:
+                response_data.append({"status": "error", "errors": error.detail})
+                continue
+            validated_data = serializer.validated_data
+            response_data.append(self.save_result(validated_data, recorded_at))
+
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    @transaction.atomic
+    def save_result(self, validated_data, recorded_at):
+        student = validated_data['student']
+        standard = validated_data['standard']
+        grade = round(float(validated_data['grade']))
+        attempts = models.StudentStandardAttempt.objects.filter(student=student, standard=standard)
+        if attempts.filter(recorded_at=recorded_at, value=validated_data['value']).exists():
+            return {"status": "duplicate"}
+
+        latest_recorded_at = sync.get_latest_recorded_at(student, standard)
+        if latest_recorded_at is not None and recorded_at < latest_recorded_at:
+            # Newer result is already known, keep this one as history only
+            models.StudentStandardAttempt.objects.create(
+                student=student,
+                standard=standard,
+                level=validated_data['level'],
+                value=validated_data['value'],
+                grade=grade,
+                recorded_at=recorded_at,
+            )
+            return {"status": "outdated"}
+
+        result = models.StudentStandard.objects.filter(student=student, standard=standard).first()
+        if result is None:
+            result = models.StudentStandard(student=student, standard=standard)
+        result.value = validated_data['value']
+        result.grade = grade
+        result.save(recorded_at=recorded_at)
+        return {
+            "status": "applied",
+            "result": {field: getattr(result, field) for field in sync.RESULT_FIELDS},
+        }
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StandardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'standards'
+
+    def ready(self):
+        from . import signals  # noqa
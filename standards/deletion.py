@@ -0,0 +1,120 @@
+"""Set based soft delete and restore of classes and students.
+
+`SoftDeleteModel.delete()` cascades object by object, saving every student
+and result of a class separately. Here a class, its students and their
+results are marked by one update per table in one transaction. `delete()`
+and `restore()` of classes and students are made by these functions too.
+
+Rows deleted together get the same `deleted_at`, so restore brings back
+only the rows deleted with the restored class or student, while rows
+deleted earlier on their own stay deleted.
+
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import models
+from .scope import invalidate_owner_scope
+
+
+def soft_delete_classes(classes) -> dict[str, int]:
+    """Soft delete classes with their students and results."""
+    classes = models.StudentClass.objects.filter(
+        id__in=list(classes.filter(deleted_at__isnull=True).values_list("id", flat=True)),
+    )
+    owner_ids = set(classes.values_list("class_owner_id", flat=True))
+    counts = _soft_delete(
+        classes,
+        models.Student.objects.filter(student_class__in=classes),
+    )
+    invalidate_owner_scope(*owner_ids)
+    return counts
+
+
+def soft_delete_students(students) -> dict[str, int]:
+    """Soft delete students with their results."""
+    students = students.filter(deleted_at__isnull=True)
+    owner_ids = set(students.values_list("student_class__class_owner_id", flat=True))
+    counts = _soft_delete(models.StudentClass.objects.none(), students)
+    invalidate_owner_scope(*owner_ids)
+    return counts
+
+
+def _soft_delete(classes, students) -> dict[str, int]:
+    now = timezone.now()
+    archived = {"deleted_at": now, "restored_at": None, "updated_at": now}
+    # Rows are selected by subqueries of not deleted rows, so children are
+    # updated before their parents
+    with transaction.atomic():
+        results_count = models.StudentStandard.objects.filter(
+            student__in=students,
+        ).update(**archived)
+        students_count = students.update(**archived)
+        classes_count = classes.update(**archived)
+    return {
+        "classes": classes_count,
+        "students": students_count,
+        "results": results_count,
+    }
+
+
+def restore_classes(classes) -> dict[str, int]:
+    """Restore deleted classes with students and results deleted with them."""
+    classes = models.StudentClass.deleted_objects.filter(
+        id__in=list(classes.filter(deleted_at__isnull=False).values_list("id", flat=True)),
+    )
+    owner_ids = set(classes.values_list("class_owner_id", flat=True))
+    deleted_with_class = models.StudentClass.deleted_objects.filter(
+        id=OuterRef("student_class_id"),
+        deleted_at=OuterRef("deleted_at"),
+    )
+    counts = _restore(
+        classes,
+        models.Student.deleted_objects.filter(
+            Exists(deleted_with_class),
+            student_class__in=classes,
+        ),
+    )
+    invalidate_owner_scope(*owner_ids)
+    return counts
+
+
+def restore_students(students) -> dict[str, int]:
+    """Restore deleted students with results deleted with them.
+
+    Students of deleted classes are not restored, restore the class instead.
+
+    """
+    students = students.filter(
+        deleted_at__isnull=False,
+        student_class__deleted_at__isnull=True,
+    )
+    owner_ids = set(students.values_list("student_class__class_owner_id", flat=True))
+    counts = _restore(models.StudentClass.deleted_objects.none(), students)
+    invalidate_owner_scope(*owner_ids)
+    return counts
+
+
+def _restore(classes, students) -> dict[str, int]:
+    now = timezone.now()
+    restored = {"deleted_at": None, "restored_at": now, "updated_at": now}
+    deleted_with_student = models.Student.deleted_objects.filter(
+        id=OuterRef("student_id"),
+        deleted_at=OuterRef("deleted_at"),
+    )
+    # Rows are selected by subqueries of deleted rows and restored rows
+    # are matched by `deleted_at` of their parents, so children are
+    # updated before their parents
+    with transaction.atomic():
+        results_count = models.StudentStandard.deleted_objects.filter(
+            Exists(deleted_with_student),
+            student__in=students,
+        ).update(**restored)
+        students_count = students.update(**restored)
+        classes_count = classes.update(**restored)
+    return {
+        "classes": classes_count,
+        "students": students_count,
+        "results": results_count,
+    }
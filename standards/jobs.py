@@ -0,0 +1,8 @@
+from jobs.registry import register
+
+from .rollover import rollover_classes
+
+
+@register("rollover_classes")
+def rollover(job):
+    return rollover_classes(job.owner)
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.2 on 2026-10-19 17:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0009_alter_studentstandard_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentStandardAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.FloatField(verbose_name='Значение')),
+                ('grade', models.IntegerField(verbose_name='Оценка')),
+                ('school_year', models.PositiveSmallIntegerField(help_text='Год начала учебного года, 2024 для 2024/2025', verbose_name='Учебный год')),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время записи результата')),
+            ],
+            options={
+                'verbose_name': 'Попытка сдачи норматива',
+                'verbose_name_plural': 'Попытки сдачи нормативов',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='studentstandard',
+            index=models.Index(fields=['student', 'standard'], name='standards_s_student_74709f_idx'),
+        ),
+        migrations.AddField(
+            model_name='studentstandardattempt',
+            name='level',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attempts', to='standards.level', verbose_name='Уровень'),
+        ),
+        migrations.AddField(
+            model_name='studentstandardattempt',
+            name='standard',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='standards.standard', verbose_name='Норматив'),
+        ),
+        migrations.AddField(
+            model_name='studentstandardattempt',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='attempts', to='standards.student', verbose_name='Ученик'),
+        ),
+        migrations.AddIndex(
+            model_name='studentstandardattempt',
+            index=models.Index(fields=['school_year', 'student', 'standard', 'recorded_at'], name='attempt_year_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentstandardattempt',
+            index=models.Index(fields=['school_year', 'standard', 'recorded_at'], name='attempt_year_standard_idx'),
+        ),
+    ]
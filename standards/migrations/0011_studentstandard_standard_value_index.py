@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-19 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0010_studentstandardattempt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentstandard',
+            index=models.Index(fields=['standard', 'value'], name='standards_s_standar_7b9390_idx'),
+        ),
+    ]
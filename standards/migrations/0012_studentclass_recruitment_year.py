@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:05
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def fill_recruitment_year(apps, schema_editor):
+    StudentClass = apps.get_model("standards", "StudentClass")
+    # School year starting on the 1st of September, as of this migration
+    today = timezone.localdate()
+    school_year = today.year if today.month >= 9 else today.year - 1
+    StudentClass.objects.update(recruitment_year=school_year - F("number") + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0011_studentstandard_standard_value_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentclass',
+            name='recruitment_year',
+            field=models.PositiveSmallIntegerField(null=True, editable=False),
+        ),
+        migrations.RunPython(fill_recruitment_year, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='studentclass',
+            name='recruitment_year',
+            field=models.PositiveSmallIntegerField(db_index=True, editable=False, help_text='Учебный год, в котором класс был первым', verbose_name='Год набора класса'),
+        ),
+    ]
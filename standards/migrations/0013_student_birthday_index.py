@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0012_studentclass_recruitment_year'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='birthday',
+            field=models.DateField(db_index=True, verbose_name='Дата рождения ученика'),
+        ),
+    ]
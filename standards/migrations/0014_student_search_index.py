@@ -0,0 +1,91 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:40
+
+import sqlite3
+
+from django.db import migrations
+
+
+def uses_fts(connection):
+    # Trigram tokenizer of FTS5 is available since SQLite 3.34
+    return (
+        connection.vendor == "sqlite"
+        and sqlite3.sqlite_version_info >= (3, 34, 0)
+    )
+
+
+def uses_trigram_index(connection):
+    return connection.vendor == "postgresql"
+
+
+class RunSQLIf(migrations.RunSQL):
+    """SQL applied only to databases the condition holds for."""
+
+    def __init__(self, condition, *args, **kwargs):
+        self.condition = condition
+        super().__init__(*args, **kwargs)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self.condition(schema_editor.connection):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if self.condition(schema_editor.connection):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0013_student_birthday_index'),
+    ]
+
+    operations = [
+        RunSQLIf(
+            uses_fts,
+            [
+                "CREATE VIRTUAL TABLE IF NOT EXISTS standards_student_fts "
+                "USING fts5(full_name, content='standards_student', "
+                "content_rowid='id', tokenize='trigram')",
+                """
+                CREATE TRIGGER IF NOT EXISTS standards_student_fts_ai
+                AFTER INSERT ON standards_student BEGIN
+                    INSERT INTO standards_student_fts (rowid, full_name)
+                    VALUES (new.id, new.full_name);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS standards_student_fts_ad
+                AFTER DELETE ON standards_student BEGIN
+                    INSERT INTO standards_student_fts (standards_student_fts, rowid, full_name)
+                    VALUES ('delete', old.id, old.full_name);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS standards_student_fts_au
+                AFTER UPDATE OF full_name ON standards_student BEGIN
+                    INSERT INTO standards_student_fts (standards_student_fts, rowid, full_name)
+                    VALUES ('delete', old.id, old.full_name);
+                    INSERT INTO standards_student_fts (rowid, full_name)
+                    VALUES (new.id, new.full_name);
+                END
+                """,
+                "INSERT INTO standards_student_fts (standards_student_fts) "
+                "VALUES ('rebuild')",
+            ],
+            [
+                "DROP TRIGGER IF EXISTS standards_student_fts_ai",
+                "DROP TRIGGER IF EXISTS standards_student_fts_ad",
+                "DROP TRIGGER IF EXISTS standards_student_fts_au",
+                "DROP TABLE IF EXISTS standards_student_fts",
+            ],
+        ),
+        RunSQLIf(
+            uses_trigram_index,
+            [
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "CREATE INDEX IF NOT EXISTS standards_student_full_name_trgm "
+                "ON standards_student USING gin (full_name gin_trgm_ops)",
+            ],
+            ["DROP INDEX IF EXISTS standards_student_full_name_trgm"],
+        ),
+    ]
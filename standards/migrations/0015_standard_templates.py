@@ -0,0 +1,39 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0014_student_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standard',
+            name='is_template',
+            field=models.BooleanField(db_index=True, default=False, help_text='Другие тренеры могут подписаться на шаблон', verbose_name='Шаблон'),
+        ),
+        migrations.AddField(
+            model_name='standard',
+            name='source',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='forks', to='standards.standard', verbose_name='Шаблон, с которого скопирован норматив'),
+        ),
+        migrations.CreateModel(
+            name='StandardSubscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата подписки')),
+                ('standard', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to='standards.standard', verbose_name='Шаблон норматива')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standard_subscriptions', to=settings.AUTH_USER_MODEL, verbose_name='Тренер')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='standardsubscription',
+            constraint=models.UniqueConstraint(fields=('user', 'standard'), name='unique_standard_subscription'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0017_created_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentstandardattempt',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='standards.student', verbose_name='Ученик'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0018_attempt_student_cascade'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassRollover',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_year', models.PositiveSmallIntegerField(help_text='Год начала учебного года, 2024 для 2024/2025', verbose_name='Учебный год')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата перевода классов')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='class_rollovers', to=settings.AUTH_USER_MODEL, verbose_name='Тренер')),
+            ],
+            options={
+                'verbose_name': 'Перевод классов',
+                'verbose_name_plural': 'Переводы классов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='classrollover',
+            constraint=models.UniqueConstraint(fields=('owner', 'school_year'), name='unique_class_rollover'),
+        ),
+    ]
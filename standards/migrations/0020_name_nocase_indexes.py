@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:03
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standards', '0019_class_rollover'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='standard',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'nocase'), name='standards_standard_name_nocase'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(django.db.models.functions.comparison.Collate('full_name', 'nocase'), name='standards_student_name_nocase'),
+        ),
+    ]
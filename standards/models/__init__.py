@@ -1,3 +1,4 @@
+from .attempts import StudentStandardAttempt
 from .standards import (
     Standard,
 
@@ -6,3 +7,5 @@ from .standards import (
     StudentStandard,
     Level,
 )
+from .rollovers import ClassRollover
+from .subscriptions import StandardSubscription
@@ -0,0 +1,143 @@
+from django.db import models
+from django.db.models import functions
+from django.utils import timezone
+
+from ..school_year import TERM_START_MONTHS, get_school_year
+
+
+class StudentStandardAttemptQuerySet(models.QuerySet):
+
+    def for_school_year(self, school_year: int):
+        """Return attempts of single school year partition."""
+        return self.filter(school_year=school_year)
+
+    def bucketed(self, bucket: str, aggregate: str):
+        """Return one row per time bucket, grouped by database.
+
+        Rows are dicts with `aggregated_value` of attempts of the bucket and
+        their `count`. Week and month buckets are identified by `bucket_start`,
+        terms by `school_year` and `term` (1-4).
+
+        """
+        if bucket == "term":
+            queryset = self.annotate(term=self._get_term_expression())
+            keys = ("school_year", "term")
+        else:
+            queryset = self.annotate(bucket_start=functions.Trunc(
+                "recorded_at",
+                bucket,
+                output_field=models.DateTimeField(),
+            ))
+            keys = ("bucket_start",)
+
+        if aggregate == "last":
+            partition = [models.F(key) for key in keys]
+            queryset = queryset.annotate(
+                aggregated_value=models.Window(
+                    functions.FirstValue("value"),
+                    partition_by=partition,
+                    order_by=models.F("recorded_at").desc(),
+                ),
+                count=models.Window(models.Count("id"), partition_by=partition),
+            ).values(*keys, "aggregated_value", "count").distinct()
+        else:
+            aggregate_function = models.Avg if aggregate == "mean" else models.Max
+            queryset = queryset.values(*keys).annotate(
+                aggregated_value=aggregate_function("value"),
+                count=models.Count("id"),
+            )
+
+        return queryset.order_by(*keys)
+
+    def _get_term_expression(self) -> models.Case:
+        """Return expression of term number by month of `recorded_at`."""
+        whens = []
+        for term, start_month in enumerate(TERM_START_MONTHS, start=1):
+            end_month = TERM_START_MONTHS[term % len(TERM_START_MONTHS)] - 1 or 12
+            months = range(start_month, end_month + 1)
+            whens.append(models.When(recorded_at__month__in=months, then=term))
+        return models.Case(
+            *whens,
+            default=len(TERM_START_MONTHS),
+            output_field=models.IntegerField(),
+        )
+
+
+class StudentStandardAttempt(models.Model):
+    """Single recorded result of a student for a standard.
+
+    Attempts are append-only history of results, while `StudentStandard`
+    keeps only the latest one. Rows are partitioned by `school_year`: all
+    indexes start with it, so history queries of one year never scan rows
+    of other years.
+
+    """
+
+    # Supported arguments of `StudentStandardAttemptQuerySet.bucketed`
+    BUCKETS = ("week", "month", "term")
+    AGGREGATES = ("mean", "best", "last")
+
+    student = models.ForeignKey(
+        "standards.Student",
+        # Soft deleted student keeps the history, as attempts are not in the
+        # cascade of `Student.delete()`, hard deleted one takes it along
+        on_delete=models.CASCADE,
+        related_name="attempts",
+        verbose_name="Ученик",
+    )
+    standard = models.ForeignKey(
+        "standards.Standard",
+        on_delete=models.CASCADE,
+        related_name="attempts",
+        verbose_name="Норматив",
+    )
+    level = models.ForeignKey(
+        "standards.Level",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="attempts",
+        verbose_name="Уровень",
+    )
+    value = models.FloatField(
+        verbose_name="Значение",
+    )
+    grade = models.IntegerField(
+        verbose_name="Оценка",
+    )
+    school_year = models.PositiveSmallIntegerField(
+        verbose_name="Учебный год",
+        help_text="Год начала учебного года, 2024 для 2024/2025",
+    )
+    recorded_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Время записи результата",
+    )
+
+    objects = StudentStandardAttemptQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Попытка сдачи норматива"
+        verbose_name_plural = "Попытки сдачи нормативов"
+        indexes = (
+            models.Index(
+                fields=("school_year", "student", "standard", "recorded_at"),
+                name="attempt_year_student_idx",
+            ),
+            models.Index(
+                fields=("school_year", "standard", "recorded_at"),
+                name="attempt_year_standard_idx",
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        if self.school_year is None:
+            self.school_year = get_school_year(
+                timezone.localdate(self.recorded_at),
+            )
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.student_id} - {self.standard_id} "
+            f"({self.value}, Оценка: {self.grade}, {self.recorded_at})"
+        )
@@ -1,8 +1,53 @@
+from django.db import models
 from django_softdelete.models import SoftDeleteModel
+from django_softdelete.managers import SoftDeleteManager, SoftDeleteQuerySet
 from dirtyfields import DirtyFieldsMixin
 
 
-class BaseModel(DirtyFieldsMixin, SoftDeleteModel):
+class BaseManager(SoftDeleteManager.from_queryset(SoftDeleteQuerySet)):
+    """Manager of not deleted objects which respects custom queryset class.
+
+    Use `BaseManager.from_queryset(CustomQuerySet)()` to add queryset methods
+    to the `objects` manager of a model.
+
+    """
+
+    def get_queryset(self):
+        return self._queryset_class(self.model, using=self._db).filter(
+            deleted_at__isnull=True,
+        )
+
+
+class TimestampedModel(models.Model):
+    """Model with times of creation and of the last change.
+
+    Changes are tracked for sync of clients and conditional requests.
+    Querysets `update()` and `bulk_update()` do not set `updated_at`,
+    callers have to pass it themselves.
+
+    """
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name="Дата создания",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name="Дата изменения",
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
+
+class BaseModel(DirtyFieldsMixin, SoftDeleteModel, TimestampedModel):
 
     class Meta:
         abstract = True
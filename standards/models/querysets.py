@@ -0,0 +1,75 @@
+from django.db import models
+from django.utils import timezone
+from django_softdelete.managers import SoftDeleteQuerySet
+
+
+class StandardQuerySet(models.QuerySet):
+
+    def available_to(self, user):
+        """Return standards added by the user and templates they subscribed to."""
+        subscription_model = self.model._meta.get_field("subscriptions").related_model
+        subscribed = subscription_model.objects.filter(
+            user=user,
+        ).values("standard_id")
+        return self.filter(
+            models.Q(who_added=user) | models.Q(id__in=subscribed),
+        )
+
+
+class StudentStandardQuerySet(SoftDeleteQuerySet):
+
+    def relink_levels(self) -> int:
+        """Point results to levels of students' current class number and gender.
+
+        Made by one UPDATE per class number and gender pair, so number of
+        queries does not depend on number of results.
+
+        """
+        level_model = self.model._meta.get_field("level").related_model
+        class_numbers = self.values_list(
+            "student__student_class__number",
+            "student__gender",
+        ).order_by().distinct()
+
+        now = timezone.now()
+        updated_count = 0
+        for class_number, gender in class_numbers:
+            level = level_model.objects.filter(
+                standard_id=models.OuterRef("standard_id"),
+                level_number=class_number,
+                gender=gender,
+            ).values("id")[:1]
+            updated_count += self.filter(
+                student__student_class__number=class_number,
+                student__gender=gender,
+            ).update(level=models.Subquery(level), updated_at=now)
+        return updated_count
+
+    def with_percentiles(self):
+        """Annotate results with `percentile` among peers and `cohort_size`.
+
+        Peers are results of the same standard by students of the same gender
+        graded on the same level number. Percentile is the share of peers with
+        value not better than the result's one, in percents. Both are counted
+        by correlated subqueries, so only cohorts of selected results are read.
+
+        """
+        peers = self.model.objects.filter(
+            standard_id=models.OuterRef("standard_id"),
+            level__level_number=models.OuterRef("level__level_number"),
+            student__gender=models.OuterRef("student__gender"),
+        ).order_by().values("standard_id")
+
+        return self.annotate(
+            cohort_size=models.Subquery(
+                peers.annotate(count=models.Count("id")).values("count"),
+            ),
+            not_better_count=models.Subquery(
+                peers.filter(
+                    value__lte=models.OuterRef("value"),
+                ).annotate(count=models.Count("id")).values("count"),
+            ),
+            percentile=(
+                models.F("not_better_count") * 100.0 / models.F("cohort_size")
+            ),
+        )
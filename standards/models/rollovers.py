@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class ClassRollover(models.Model):
+    """School year classes of a coach were promoted to.
+
+    Rollover is made once per school year, see
+    `standards.rollover.rollover_classes`.
+
+    """
+    owner = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="class_rollovers",
+        verbose_name="Тренер",
+    )
+    school_year = models.PositiveSmallIntegerField(
+        verbose_name="Учебный год",
+        help_text="Год начала учебного года, 2024 для 2024/2025",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата перевода классов",
+    )
+
+    class Meta:
+        verbose_name = "Перевод классов"
+        verbose_name_plural = "Переводы классов"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("owner", "school_year"),
+                name="unique_class_rollover",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.owner} - {self.school_year}"
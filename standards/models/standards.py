@@ -1,9 +1,13 @@
 import datetime
 from django.db import models
+from django.db.models.functions import Collate
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from .base import BaseModel
+from ..school_year import get_recruitment_year
+from .attempts import StudentStandardAttempt
+from .base import BaseManager, BaseModel, TimestampedModel
+from .querysets import StandardQuerySet, StudentStandardQuerySet
 
 
 class StudentClass(BaseModel):
@@ -24,14 +28,15 @@ class StudentClass(BaseModel):
         on_delete=models.PROTECT,
         verbose_name="Куратор класса",
     )
-
-    @property
-    def recruitment_year(self):
-        current_year = timezone.now().year
-        return current_year - self.number
+    recruitment_year = models.PositiveSmallIntegerField(
+        verbose_name="Год набора класса",
+        help_text="Учебный год, в котором класс был первым",
+        editable=False,
+        db_index=True,
+    )
 
     def clean(self):
-        if self.recruitment_year > datetime.date.today().year:
+        if get_recruitment_year(self.number) > datetime.date.today().year:
             raise ValidationError(
                 "Год набора не может быть позднее текущего года.",
             )
@@ -40,10 +45,32 @@ class StudentClass(BaseModel):
         return f"{self.number}{self.class_name}"
 
     def save(self, *args, **kwargs):
-        if not self.id:
-            self.recruitment_date = self.recruitment_year
+        # Recruitment year stays the same on rollover, as number and school
+        # year grow together, so it is set only when number is set by hand
+        if self.recruitment_year is None or "number" in self.get_dirty_fields():
+            self.recruitment_year = get_recruitment_year(self.number)
         super().save(*args, **kwargs)
 
+    def delete(self, *args, **kwargs):
+        """Soft delete the class with its students and their results.
+
+        Made by set based updates of `standards.deletion` instead of the
+        object by object cascade of `SoftDeleteModel`, which would also
+        load and save every attempt of the students.
+
+        """
+        from ..deletion import soft_delete_classes
+
+        soft_delete_classes(StudentClass.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=("deleted_at", "restored_at", "updated_at"))
+
+    def restore(self, *args, **kwargs):
+        """Restore the class with students and results deleted with it."""
+        from ..deletion import restore_classes
+
+        restore_classes(StudentClass.deleted_objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=("deleted_at", "restored_at", "updated_at"))
+
 
 class Student(BaseModel):
     full_name = models.CharField(
@@ -58,6 +85,7 @@ class Student(BaseModel):
     )
     birthday = models.DateField(
         verbose_name="Дата рождения ученика",
+        db_index=True,
     )
 
     class Gender(models.TextChoices):
@@ -70,6 +98,38 @@ class Student(BaseModel):
         verbose_name="Пол ученика",
     )
 
+    class Meta:
+        indexes = (
+            # Admin looks students up by the start of the name, LIKE of
+            # SQLite ignores case and uses only indexes with NOCASE collation
+            models.Index(
+                Collate("full_name", "nocase"),
+                name="standards_student_name_nocase",
+            ),
+        )
+
+    def delete(self, *args, **kwargs):
+        """Soft delete the student with results, attempts are kept.
+
+        See `StudentClass.delete()`.
+
+        """
+        from ..deletion import soft_delete_students
+
+        soft_delete_students(Student.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=("deleted_at", "restored_at", "updated_at"))
+
+    def restore(self, *args, **kwargs):
+        """Restore the student with results deleted with them.
+
+        Student of a deleted class is restored with the class only.
+
+        """
+        from ..deletion import restore_students
+
+        restore_students(Student.deleted_objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=("deleted_at", "restored_at", "updated_at"))
+
     def __str__(self) -> str:
         return (
             f"Ученик {self.full_name} ({self.birthday} г.р.), "
@@ -96,7 +156,7 @@ class Student(BaseModel):
 #         )
 
 
-class Standard(models.Model):
+class Standard(TimestampedModel):
     name = models.CharField(
         max_length=255,
         verbose_name="Название норматива",
@@ -110,6 +170,31 @@ class Standard(models.Model):
         verbose_name="Является ли это умением или нормативом",
         help_text="Если True, то это умение. Иначе - норматив",
     )
+    is_template = models.BooleanField(
+        default=False,
+        db_index=True,
+        verbose_name="Шаблон",
+        help_text="Другие тренеры могут подписаться на шаблон",
+    )
+    source = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="forks",
+        verbose_name="Шаблон, с которого скопирован норматив",
+    )
+
+    objects = StandardQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            # See `Student.Meta`
+            models.Index(
+                Collate("name", "nocase"),
+                name="standards_standard_name_nocase",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.name
@@ -118,7 +203,7 @@ class Standard(models.Model):
         return self.levels.all()
 
 
-class Level(models.Model):
+class Level(TimestampedModel):
     level_number = models.IntegerField(
         validators=(
             MinValueValidator(1),
@@ -259,7 +344,22 @@ class StudentStandard(BaseModel):
         null=True
     )
 
-    def save(self, *args, **kwargs):
+    objects = BaseManager.from_queryset(StudentStandardQuerySet)()
+
+    class Meta:
+        indexes = (
+            # Latest result of a student is looked up by this pair
+            models.Index(fields=("student", "standard")),
+            # Peers of a result are ranked by value within a standard
+            models.Index(fields=("standard", "value")),
+        )
+
+    def save(self, *args, recorded_at=None, **kwargs):
+        """Save the latest result and append it to attempts history.
+
+        `recorded_at` is the moment result was taken, now by default.
+
+        """
         # Ensure grade is an integer
         if isinstance(self.grade, float):
             self.grade = round(self.grade)
@@ -271,26 +371,42 @@ class StudentStandard(BaseModel):
         self.level = None
 
         try:
-            # Fetch the standard value by name
-            standard_value = Standard.objects.get(name=self.standard.name)
-
             # Try to fetch the level corresponding to the standard and class number
             self.level = Level.objects.get(
-                standard=standard_value,
+                standard_id=self.standard_id,
                 level_number=student_class_number,
                 gender=self.student.gender,
             )
-        except Standard.DoesNotExist:
-            logging.error(f"Standard '{self.standard.name}' does not exist.")
         except Level.DoesNotExist:
             logging.error(
                 f"Level for standard '{self.standard.name}' and class number '{student_class_number}' does not exist.")
         except Exception as e:
             logging.error(f"An unexpected error occurred: {e}")
 
+        is_new_result = self._is_new_result(kwargs.get("update_fields"))
+
         # Proceed with saving the instance
         super().save(*args, **kwargs)
 
+        if is_new_result:
+            StudentStandardAttempt.objects.create(
+                student_id=self.student_id,
+                standard_id=self.standard_id,
+                level_id=self.level_id,
+                value=self.value,
+                grade=self.grade,
+                recorded_at=recorded_at or timezone.now(),
+            )
+
+    def _is_new_result(self, update_fields=None) -> bool:
+        """Check whether saving changes recorded result."""
+        result_fields = {"value", "grade"}
+        if update_fields is not None and not result_fields & set(update_fields):
+            return False
+        return self._state.adding or bool(
+            result_fields & self.get_dirty_fields().keys(),
+        )
+
     def __str__(self) -> str:
         return (
             f"{self.student} - {self.standard} "
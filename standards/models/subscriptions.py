@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class StandardSubscription(models.Model):
+    """Coach's use of a shared standard template.
+
+    Template and its levels are stored once, subscribers grade their
+    students by the same rows until they change the template for
+    themselves, see `standards.sharing.fork_standard`.
+
+    """
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="standard_subscriptions",
+        verbose_name="Тренер",
+    )
+    standard = models.ForeignKey(
+        "standards.Standard",
+        on_delete=models.CASCADE,
+        related_name="subscriptions",
+        verbose_name="Шаблон норматива",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата подписки",
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("user", "standard"),
+                name="unique_standard_subscription",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.user} - {self.standard}"
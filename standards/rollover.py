@@ -0,0 +1,89 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import models
+from .school_year import get_school_year
+from .scope import invalidate_owner_scope
+
+GRADUATION_CLASS_NUMBER = 11
+
+
+class RolloverError(Exception):
+
+    def __init__(self, school_year: int):
+        super().__init__(
+            f"Classes are already moved to {school_year}/{school_year + 1} school year.",
+        )
+
+
+def check_rollover(owner, school_year: int | None = None):
+    """Raise `RolloverError` if classes of the owner are already promoted.
+
+    Classes are promoted to a school year once, a repeated rollover
+    would promote them once more and archive classes of the last grade.
+
+    """
+    if school_year is None:
+        school_year = get_school_year()
+    if models.ClassRollover.objects.filter(owner=owner, school_year__gte=school_year).exists():
+        raise RolloverError(school_year)
+
+
+def rollover_classes(owner, school_year: int | None = None) -> dict[str, int]:
+    """Move classes of the owner to the school year, current by default.
+
+    Classes of the last grade are archived (soft deleted) with their students
+    and results, others are promoted by one grade and their results are
+    re-linked to levels of the new grade. Everything is done by set based
+    updates in one transaction, so number of queries does not depend on
+    number of classes and students.
+
+    School year is recorded, `RolloverError` is raised for a repeated
+    rollover, see `check_rollover`.
+
+    """
+    if school_year is None:
+        school_year = get_school_year()
+    now = timezone.now()
+    classes = models.StudentClass.objects.filter(class_owner=owner)
+    with transaction.atomic():
+        check_rollover(owner, school_year)
+        try:
+            # Unique constraint stops concurrent rollovers of the same year
+            with transaction.atomic():
+                models.ClassRollover.objects.create(owner=owner, school_year=school_year)
+        except IntegrityError:
+            raise RolloverError(school_year)
+
+        promoted_ids = list(
+            classes.filter(
+                number__lt=GRADUATION_CLASS_NUMBER,
+            ).values_list("id", flat=True),
+        )
+
+        graduated_classes = classes.filter(number__gte=GRADUATION_CLASS_NUMBER)
+        graduated_students = models.Student.objects.filter(
+            student_class__in=graduated_classes,
+        )
+        archived = {"deleted_at": now, "restored_at": None, "updated_at": now}
+        models.StudentStandard.objects.filter(
+            student__in=graduated_students,
+        ).update(**archived)
+        graduated_students_count = graduated_students.update(**archived)
+        graduated_classes_count = graduated_classes.update(**archived)
+
+        promoted_classes_count = models.StudentClass.objects.filter(
+            id__in=promoted_ids,
+        ).update(number=F("number") + 1, updated_at=now)
+        relinked_results_count = models.StudentStandard.objects.filter(
+            student__student_class_id__in=promoted_ids,
+        ).relink_levels()
+
+    invalidate_owner_scope(owner.pk)
+    return {
+        "promoted_classes": promoted_classes_count,
+        "graduated_classes": graduated_classes_count,
+        "graduated_students": graduated_students_count,
+        "relinked_results": relinked_results_count,
+    }
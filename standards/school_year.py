@@ -0,0 +1,40 @@
+import datetime
+
+from django.utils import timezone
+
+# School year starts on the 1st of September and is named by its first year,
+# e.g. 2024 means 2024/2025 school year
+SCHOOL_YEAR_START_MONTH = 9
+
+
+def get_school_year(date: datetime.date | None = None) -> int:
+    """Return school year of the given date, today by default."""
+    if date is None:
+        date = timezone.localdate()
+    if date.month >= SCHOOL_YEAR_START_MONTH:
+        return date.year
+    return date.year - 1
+
+
+def get_recruitment_year(class_number: int, school_year: int | None = None) -> int:
+    """Return school year when class of the given number was in 1st grade."""
+    if school_year is None:
+        school_year = get_school_year()
+    return school_year - class_number + 1
+
+
+def get_school_year_start(school_year: int) -> datetime.date:
+    """Return first day of the school year."""
+    return datetime.date(school_year, SCHOOL_YEAR_START_MONTH, 1)
+
+
+# School year is split into four terms (quarters) starting in these months
+TERM_START_MONTHS = (9, 11, 1, 4)
+
+
+def get_term_start(school_year: int, term: int) -> datetime.date:
+    """Return first day of the term (1-4) of the school year."""
+    month = TERM_START_MONTHS[term - 1]
+    if month >= SCHOOL_YEAR_START_MONTH:
+        return datetime.date(school_year, month, 1)
+    return datetime.date(school_year + 1, month, 1)
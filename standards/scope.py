@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.functional import cached_property
+
+from auth.users.models import User
+
+from . import models
+
+
+class OwnerScope:
+    """Ids of classes and students owned by a coach.
+
+    Ids are kept in the instance for the current request and in the cache for
+    `OWNER_SCOPE_CACHE_TIMEOUT` seconds. Cache keys include `scope_version` of
+    the coach, which is incremented in database on changes of coach's classes
+    and students (see `standards.signals`), so ids cached by any process are
+    dropped at once. Set based updates must call `invalidate_owner_scope`
+    themselves.
+
+    Use ids both to check access to a single object and to filter querysets
+    with `__in` lookups instead of joining classes by owner.
+
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+
+    @cached_property
+    def class_ids(self) -> frozenset[int]:
+        return self._get_ids(
+            "classes",
+            models.StudentClass.objects.filter(class_owner_id=self.user_id),
+        )
+
+    @cached_property
+    def student_ids(self) -> frozenset[int]:
+        return self._get_ids(
+            "students",
+            models.Student.objects.filter(student_class_id__in=self.class_ids),
+        )
+
+    @cached_property
+    def version(self) -> int:
+        return User.objects.filter(
+            pk=self.user_id,
+        ).values_list("scope_version", flat=True).first() or 0
+
+    def _get_ids(self, name: str, queryset) -> frozenset[int]:
+        key = _get_cache_key(self.user_id, self.version, name)
+        ids = cache.get(key)
+        if ids is None:
+            ids = frozenset(queryset.values_list("id", flat=True))
+            cache.set(key, ids, settings.OWNER_SCOPE_CACHE_TIMEOUT)
+        return ids
+
+
+def get_owner_scope(request) -> OwnerScope:
+    """Return scope of request user, shared within the request."""
+    scope = getattr(request, "_owner_scope", None)
+    if scope is None or scope.user_id != request.user.pk:
+        scope = OwnerScope(request.user.pk)
+        request._owner_scope = scope
+    return scope
+
+
+def invalidate_owner_scope(*user_ids: int):
+    """Drop cached ids of the given coaches.
+
+    Version is changed in the transaction of the change, so other requests
+    keep using cached ids until it is committed.
+
+    """
+    if user_ids:
+        User.objects.filter(pk__in=user_ids).update(
+            scope_version=F("scope_version") + 1,
+        )
+
+
+def _get_cache_key(user_id: int, version: int, name: str) -> str:
+    return f"standards:owner-scope:{user_id}:{version}:{name}"
@@ -0,0 +1,252 @@
+"""Search of students by full name.
+
+On SQLite names are indexed by FTS5 table with trigram tokenizer, kept in
+sync with students table by triggers. On PostgreSQL trigram GIN index of
+pg_trgm is used. Other databases fall back to plain substring lookup.
+
+"""
+import sqlite3
+from difflib import SequenceMatcher
+
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+from .models import Student
+
+STUDENT_TABLE = Student._meta.db_table
+SEARCH_TABLE = f"{STUDENT_TABLE}_fts"
+TRIGRAM_INDEX = f"{STUDENT_TABLE}_full_name_trgm"
+
+# Trigram tokenizer of FTS5 is available since SQLite 3.34
+SQLITE_TRIGRAM_VERSION = (3, 34, 0)
+
+SQLITE_TRIGGERS = {
+    f"{SEARCH_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai
+        AFTER INSERT ON {STUDENT_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE} (rowid, full_name)
+            VALUES (new.id, new.full_name);
+        END
+    """,
+    f"{SEARCH_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad
+        AFTER DELETE ON {STUDENT_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, full_name)
+            VALUES ('delete', old.id, old.full_name);
+        END
+    """,
+    f"{SEARCH_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au
+        AFTER UPDATE OF full_name ON {STUDENT_TABLE} BEGIN
+            INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, full_name)
+            VALUES ('delete', old.id, old.full_name);
+            INSERT INTO {SEARCH_TABLE} (rowid, full_name)
+            VALUES (new.id, new.full_name);
+        END
+    """,
+}
+
+
+def uses_fts(connection) -> bool:
+    return (
+        connection.vendor == "sqlite"
+        and sqlite3.sqlite_version_info >= SQLITE_TRIGRAM_VERSION
+    )
+
+
+def create_search_index(connection):
+    """Create search index of student names and fill it."""
+    with connection.cursor() as cursor:
+        if uses_fts(connection):
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                f"USING fts5(full_name, content='{STUDENT_TABLE}', "
+                f"content_rowid='id', tokenize='trigram')"
+            )
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} "
+                f"ON {STUDENT_TABLE} USING gin (full_name gin_trgm_ops)"
+            )
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if uses_fts(connection):
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+def ensure_search_index(connection):
+    """Restore triggers of FTS index if they were lost.
+
+    SQLite backend of Django rebuilds a table on most schema changes, and
+    triggers of the old table are dropped with it, so after migrations
+    missing triggers are created again and index is rebuilt.
+
+    """
+    if not uses_fts(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = %s",
+            [STUDENT_TABLE],
+        )
+        existing = {name for name, in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = %s",
+            [SEARCH_TABLE],
+        )
+        if cursor.fetchone() is None:
+            # Index is not created by migrations yet
+            return
+    if not existing.issuperset(SQLITE_TRIGGERS):
+        create_search_index(connection)
+
+
+# Number of names matched by the index which are ranked in Python
+SEARCH_CANDIDATES = 200
+
+
+def _normalize(text: str) -> str:
+    return text.lower().replace("ё", "е")
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _typo_variants(word: str) -> list[str]:
+    """Return FTS expressions matching the word with one typo.
+
+    Typo in the first half of the word leaves the second half intact and
+    vice versa. Words shorter than 6 characters are matched by their
+    first or last three characters, the rest is up to ranking.
+
+    """
+    middle = max(len(word) // 2, 3)
+    return [_quote(word[:middle]), _quote(word[-middle:])]
+
+
+def _word_score(word: str, token: str) -> float:
+    if token == word:
+        return 1.0
+    if token.startswith(word):
+        return 0.9
+    if word in token:
+        return 0.7
+    return 0.8 * SequenceMatcher(None, word, token[:len(word) + 1]).ratio()
+
+
+def _score(words: list[str], full_name: str) -> float:
+    tokens = _normalize(full_name).split()
+    return sum(
+        max(_word_score(word, token) for token in tokens) for word in words
+    )
+
+
+def _match(queryset, expression: str) -> dict[int, str]:
+    connection = connections[queryset.db]
+    subquery, params = queryset.order_by().values("id").query.sql_with_params()
+    with connection.cursor() as cursor:
+        # Unary plus keeps rowid constraint out of FTS index, otherwise
+        # the full text query is run once per student of the queryset
+        cursor.execute(
+            f"SELECT rowid, full_name FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND +rowid IN ({subquery}) "
+            f"LIMIT %s",
+            [expression, *params, SEARCH_CANDIDATES],
+        )
+        return dict(cursor.fetchall())
+
+
+def _search_fts(queryset, query: str, limit: int) -> list[Student]:
+    words = _normalize(query).split()
+    # Trigram index can not match words shorter than 3 characters
+    indexed_words = [word for word in words if len(word) >= 3]
+    if not indexed_words:
+        return _search_prefix(queryset, words, limit)
+
+    candidates = _match(queryset, " AND ".join(map(_quote, indexed_words)))
+    if len(candidates) < limit:
+        typo_expression = " AND ".join(
+            "(" + " OR ".join(_typo_variants(word)) + ")"
+            for word in indexed_words
+        )
+        candidates.update(_match(queryset, typo_expression))
+
+    # Index finds names containing the words anywhere, ranking puts whole
+    # words and prefixes of words first
+    ids = sorted(
+        candidates,
+        key=lambda student_id: (
+            -_score(words, candidates[student_id]),
+            candidates[student_id],
+        ),
+    )[:limit]
+    students = queryset.in_bulk(ids)
+    return [students[student_id] for student_id in ids if student_id in students]
+
+
+def _search_prefix(queryset, words: list[str], limit: int) -> list[Student]:
+    """Return students having names with words starting with all `words`.
+
+    LIKE of SQLite ignores case of ASCII letters only, so names are
+    compared in Python. Queryset is limited to students of a coach, so
+    reading their names is cheap.
+
+    """
+    names = dict(queryset.order_by().values_list("id", "full_name"))
+    ids = sorted(
+        (
+            student_id
+            for student_id, full_name in names.items()
+            if all(
+                any(token.startswith(word) for token in _normalize(full_name).split())
+                for word in words
+            )
+        ),
+        key=lambda student_id: (-_score(words, names[student_id]), names[student_id]),
+    )[:limit]
+    students = queryset.in_bulk(ids)
+    return [students[student_id] for student_id in ids if student_id in students]
+
+
+def _search_trigram(queryset, query: str, limit: int) -> list[Student]:
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # "<%" operator is served by trigram GIN index, unlike the function
+    matches = RawSQL(
+        f"%s <%% {STUDENT_TABLE}.full_name",
+        (query,),
+        output_field=BooleanField(),
+    )
+    return list(
+        queryset.filter(matches)
+        .annotate(similarity=TrigramWordSimilarity(query, "full_name"))
+        .order_by("-similarity", "full_name")[:limit]
+    )
+
+
+def search_students(queryset, query: str, limit: int) -> list[Student]:
+    """Return up to `limit` students of queryset best matching the query."""
+    queryset = queryset.select_related("student_class")
+    connection = connections[queryset.db]
+    if uses_fts(connection):
+        return _search_fts(queryset, query, limit)
+    if connection.vendor == "postgresql":
+        return _search_trigram(queryset, query, limit)
+    return list(
+        queryset.filter(full_name__icontains=query).order_by("full_name")[:limit]
+    )
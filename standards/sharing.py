@@ -0,0 +1,71 @@
+"""Sharing of standard templates between coaches.
+
+Subscribers of a template grade their students by the template's own
+`Standard` and `Level` rows. A private copy is made only when a
+subscriber changes the template, and their results move to the copy.
+
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from . import models
+
+
+def subscribe(user, standard) -> bool:
+    """Subscribe user to the template, return False if already subscribed."""
+    _, created = models.StandardSubscription.objects.get_or_create(
+        user=user,
+        standard=standard,
+    )
+    return created
+
+
+def unsubscribe(user, standard) -> bool:
+    deleted_count, _ = models.StandardSubscription.objects.filter(
+        user=user,
+        standard=standard,
+    ).delete()
+    return bool(deleted_count)
+
+
+@transaction.atomic
+def fork_standard(standard, user):
+    """Copy the template with its levels for the user.
+
+    Results and attempts of the user's students are moved to the copy and
+    the subscription is replaced by it. Made by a fixed number of queries.
+
+    """
+    fork = models.Standard.objects.create(
+        name=standard.name,
+        who_added=user,
+        has_numeric_value=standard.has_numeric_value,
+        source=standard,
+    )
+    models.Level.objects.bulk_create(
+        models.Level(
+            standard=fork,
+            level_number=level.level_number,
+            low_level_value=level.low_level_value,
+            middle_level_value=level.middle_level_value,
+            high_level_value=level.high_level_value,
+            gender=level.gender,
+        )
+        for level in standard.levels.all()
+    )
+
+    students = models.Student.global_objects.filter(
+        student_class__class_owner=user,
+    ).values("id")
+    models.StudentStandard.global_objects.filter(
+        standard=standard,
+        student_id__in=students,
+    ).update(standard=fork, updated_at=timezone.now())
+    models.StudentStandardAttempt.objects.filter(
+        standard=standard,
+        student_id__in=students,
+    ).update(standard=fork)
+    models.StudentStandard.objects.filter(standard=fork).relink_levels()
+
+    unsubscribe(user, standard)
+    return fork
@@ -0,0 +1,46 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from django_softdelete.signals import post_restore
+
+from . import models
+from .scope import invalidate_owner_scope
+from .search import ensure_search_index
+
+
+@receiver(post_save, sender=models.StudentClass)
+@receiver(post_delete, sender=models.StudentClass)
+@receiver(post_restore, sender=models.StudentClass)
+def invalidate_class_owner_scope(sender, instance, **kwargs):
+    invalidate_owner_scope(instance.class_owner_id)
+
+
+@receiver(post_save, sender=models.Student)
+@receiver(post_delete, sender=models.Student)
+@receiver(post_restore, sender=models.Student)
+def invalidate_student_owner_scope(sender, instance, **kwargs):
+    # Receivers of the module are connected before the one resetting dirty
+    # fields, so previous class of a moved student is still known here
+    class_ids = {
+        instance.student_class_id,
+        instance.get_dirty_fields(check_relationship=True).get("student_class"),
+    }
+    class_ids.discard(None)
+
+    owner_ids = set()
+    if models.Student.student_class.is_cached(instance):
+        owner_ids.add(instance.student_class.class_owner_id)
+        class_ids.discard(instance.student_class_id)
+    if class_ids:
+        owner_ids.update(
+            models.StudentClass.global_objects.filter(
+                id__in=class_ids,
+            ).values_list("class_owner_id", flat=True),
+        )
+    invalidate_owner_scope(*owner_ids)
+
+
+@receiver(post_migrate)
+def restore_student_search_index(sender, using, **kwargs):
+    if sender.name == "standards":
+        ensure_search_index(connections[using])
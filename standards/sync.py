@@ -0,0 +1,113 @@
+"""Delta sync of coach's data for offline clients.
+
+Client keeps the cursor returned by the previous sync and receives only
+rows changed since then, including soft deleted ones. Cursor is the time
+sync started at. Rows are compared by `updated_at` with some overlap, so
+changes committed by transactions which were running at the moment of
+previous sync are not lost. Client applies rows as upserts by id, so
+repeated rows are harmless.
+
+"""
+import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+
+from . import models
+
+SYNC_CURSOR_OVERLAP = datetime.timedelta(seconds=30)
+
+STUDENT_FIELDS = ("id", "full_name", "student_class_id", "birthday", "gender")
+RESULT_FIELDS = ("id", "student_id", "standard_id", "level_id", "value", "grade")
+
+
+def make_cursor(moment: datetime.datetime) -> str:
+    return moment.isoformat()
+
+
+def parse_cursor(cursor: str) -> datetime.datetime:
+    """Return time of the cursor, raise ValueError if it is malformed."""
+    moment = datetime.datetime.fromisoformat(cursor)
+    if timezone.is_naive(moment):
+        raise ValueError("Cursor must have a time zone.")
+    return moment
+
+
+def _split_deleted(queryset, since, fields):
+    """Return values of changed rows and ids of deleted ones."""
+    if since is None:
+        # First sync needs no tombstones
+        return list(queryset.filter(deleted_at__isnull=True).values(*fields)), []
+    changed, deleted = [], []
+    for row in queryset.filter(updated_at__gte=since).values(*fields, "deleted_at"):
+        if row.pop("deleted_at") is None:
+            changed.append(row)
+        else:
+            deleted.append(row["id"])
+    return changed, deleted
+
+
+def get_changes(user, since: datetime.datetime | None) -> dict:
+    """Return rows of the user changed since the moment, all rows if None.
+
+    Standards are returned with all their levels, when the standard or
+    any of its levels has changed. Ids of all available standards are
+    returned too, so client drops standards deleted or unsubscribed from.
+
+    """
+    if since is not None:
+        since -= SYNC_CURSOR_OVERLAP
+
+    classes, deleted_classes = _split_deleted(
+        models.StudentClass.global_objects.filter(class_owner=user),
+        since,
+        ("id", "number", "class_name", "recruitment_year"),
+    )
+    students, deleted_students = _split_deleted(
+        models.Student.global_objects.filter(student_class__class_owner=user),
+        since,
+        STUDENT_FIELDS,
+    )
+    results, deleted_results = _split_deleted(
+        models.StudentStandard.global_objects.filter(
+            student__student_class__class_owner=user,
+        ),
+        since,
+        RESULT_FIELDS,
+    )
+
+    available_standards = models.Standard.objects.available_to(user)
+    changed_standards = available_standards
+    if since is not None:
+        changed_levels = models.Level.objects.filter(
+            updated_at__gte=since,
+        ).values("standard_id")
+        new_subscriptions = models.StandardSubscription.objects.filter(
+            user=user,
+            created_at__gte=since,
+        ).values("standard_id")
+        changed_standards = available_standards.filter(
+            Q(updated_at__gte=since)
+            | Q(id__in=changed_levels)
+            | Q(id__in=new_subscriptions),
+        )
+
+    return {
+        "classes": classes,
+        "students": students,
+        "standards": changed_standards.prefetch_related("levels"),
+        "standard_ids": list(available_standards.values_list("id", flat=True)),
+        "results": results,
+        "deleted": {
+            "classes": deleted_classes,
+            "students": deleted_students,
+            "results": deleted_results,
+        },
+    }
+
+
+def get_latest_recorded_at(student, standard) -> datetime.datetime | None:
+    return models.StudentStandardAttempt.objects.filter(
+        student=student,
+        standard=standard,
+    ).order_by("-recorded_at").values_list("recorded_at", flat=True).first()
@@ -0,0 +1,61 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from auth.users.models import User
+from standards import models
+
+
+def create_user(email: str) -> User:
+    return User.objects.create_user(email=email, password="password", name=email)
+
+
+def create_standard(owner, level_numbers=range(1, 12), **kwargs) -> models.Standard:
+    """Create numeric standard with levels of both genders."""
+    standard = models.Standard.objects.create(
+        name="Бег",
+        who_added=owner,
+        has_numeric_value=True,
+        **kwargs,
+    )
+    models.Level.objects.bulk_create(
+        models.Level(
+            standard=standard,
+            level_number=level_number,
+            gender=gender,
+            low_level_value=1,
+            middle_level_value=5,
+            high_level_value=9,
+        )
+        for level_number in level_numbers
+        for gender in models.Level.Gender.values
+    )
+    return standard
+
+
+def create_student(student_class, full_name="Иванов Иван", gender="m") -> models.Student:
+    return models.Student.objects.create(
+        full_name=full_name,
+        student_class=student_class,
+        birthday=datetime.date(2012, 1, 1),
+        gender=gender,
+    )
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class StandardsAPITestCase(APITestCase):
+    """Test case with requests authenticated as a coach."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.coach = create_user("coach@example.com")
+
+    def setUp(self):
+        # Ids of rows are reused after rollback, cached owner scopes are not
+        cache.clear()
+        self.client.force_authenticate(self.coach)
@@ -0,0 +1,44 @@
+from django.urls import reverse
+
+from standards import models
+
+from .base import StandardsAPITestCase, create_student
+
+
+class ConditionalGetTests(StandardsAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.student_class = models.StudentClass.objects.create(
+            number=5,
+            class_name="А",
+            class_owner=self.coach,
+        )
+        self.student = create_student(self.student_class)
+
+    def test_media_types_have_own_etags(self):
+        url = reverse("student-standards-list", kwargs={"student_id": self.student.pk})
+
+        response = self.client.get(url)
+        columnar_response = self.client.get(url, {"format": "columnar"})
+        accept_response = self.client.get(
+            url,
+            HTTP_ACCEPT="application/vnd.coachdiary.columnar+json",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+
+        self.assertNotEqual(response["ETag"], columnar_response["ETag"])
+        self.assertEqual(accept_response.status_code, 200)
+        self.assertIn("Accept", response["Vary"])
+
+    def test_deleted_row_changes_response(self):
+        url = reverse("students-list")
+        create_student(self.student_class, full_name="Петров Петр")
+
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        models.Student.objects.latest("updated_at").delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from coachdiary.management.commands.check_query_growth import (
+    LARGE_SIZE,
+    SMALL_SIZE,
+    Dataset,
+    get_requests,
+    iter_requests,
+    make_request,
+)
+from coachdiary.query_growth import QueryGrowthMixin
+from standards.api.urls import standards_router
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryGrowthTests(QueryGrowthMixin, TestCase):
+    """Number of queries of standards API routes does not grow with data.
+
+    Same check as `check_query_growth` command, every request is made on
+    its own dataset.
+
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_all_routes_have_requests(self):
+        dataset = Dataset()
+        dataset.grow(SMALL_SIZE)
+
+        names = {pattern.name for pattern in standards_router.urls}
+        self.assertEqual(names - set(get_requests(dataset)), set())
+
+    def test_routes(self):
+        with transaction.atomic():
+            dataset = Dataset()
+            dataset.grow(SMALL_SIZE)
+            keys = [key for key, _ in iter_requests(get_requests(dataset))]
+            transaction.set_rollback(True)
+
+        for name, index in keys:
+            with self.subTest(name=name, index=index), transaction.atomic():
+                dataset = Dataset()
+                dataset.grow(SMALL_SIZE)
+                self.assertNoQueryGrowth(
+                    lambda: self.make_request(dataset, name, index),
+                    grow=lambda: dataset.grow(LARGE_SIZE),
+                    msg=f"{name} #{index}",
+                )
+                transaction.set_rollback(True)
+
+    def make_request(self, dataset, name, index):
+        # Requests are taken from the dataset of the current size
+        method, url_kwargs, data = get_requests(dataset)[name][index]
+        response = make_request(dataset, name, method, url_kwargs, data)
+        self.assertLess(response.status_code, 400, f"{method.upper()} {name}: {response.data}")
@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+
+from jobs.models import Job
+from standards import models
+from standards.jobs import rollover
+from standards.rollover import RolloverError, rollover_classes
+from standards.school_year import get_school_year
+
+from .base import StandardsAPITestCase, create_student, create_user
+
+
+class RolloverTests(StandardsAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.graduating_class = models.StudentClass.objects.create(
+            number=10,
+            class_name="А",
+            class_owner=self.coach,
+        )
+        self.student = create_student(self.graduating_class)
+
+    def test_rollover_is_made_once_per_school_year(self):
+        counts = rollover_classes(self.coach)
+        self.assertEqual(counts["promoted_classes"], 1)
+
+        with self.assertRaises(RolloverError):
+            rollover_classes(self.coach)
+
+        self.graduating_class.refresh_from_db()
+        self.assertEqual(self.graduating_class.number, 11)
+        self.assertFalse(self.graduating_class.is_deleted)
+        self.assertTrue(models.Student.objects.filter(pk=self.student.pk).exists())
+
+    def test_rollover_to_next_school_year(self):
+        school_year = get_school_year()
+        rollover_classes(self.coach, school_year)
+
+        counts = rollover_classes(self.coach, school_year + 1)
+
+        self.assertEqual(counts["graduated_classes"], 1)
+        self.assertEqual(counts["graduated_students"], 1)
+
+    def test_repeated_request_is_refused(self):
+        url = reverse("classes-rollover")
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_409_CONFLICT)
+
+        job = Job.objects.get(pk=response.data["id"])
+        rollover(job)
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.succeeded)
+
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_409_CONFLICT)
+        self.graduating_class.refresh_from_db()
+        self.assertEqual(self.graduating_class.number, 11)
+        self.assertFalse(self.graduating_class.is_deleted)
+
+
+class RolloverCommandTests(StandardsAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.student_class = models.StudentClass.objects.create(
+            number=4,
+            class_name="А",
+            class_owner=self.coach,
+        )
+
+    def test_classes_of_owner_are_promoted(self):
+        call_command("rollover_classes", owner=self.coach.email, stdout=StringIO())
+
+        self.student_class.refresh_from_db()
+        self.assertEqual(self.student_class.number, 5)
+
+        with self.assertRaisesMessage(CommandError, "already moved"):
+            call_command("rollover_classes", owner=self.coach.email, stdout=StringIO())
+
+    def test_classes_of_all_owners_are_promoted(self):
+        other_class = models.StudentClass.objects.create(
+            number=7,
+            class_name="Б",
+            class_owner=create_user("other@example.com"),
+        )
+
+        call_command("rollover_classes", all_owners=True, stdout=StringIO())
+
+        self.student_class.refresh_from_db()
+        other_class.refresh_from_db()
+        self.assertEqual(self.student_class.number, 5)
+        self.assertEqual(other_class.number, 8)
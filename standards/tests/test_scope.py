@@ -0,0 +1,27 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from standards import models
+from standards.scope import OwnerScope
+
+from .base import StandardsAPITestCase, create_student
+
+
+class OwnerScopeTests(StandardsAPITestCase):
+
+    def test_change_is_seen_by_other_processes(self):
+        student_class = models.StudentClass.objects.create(
+            number=5,
+            class_name="А",
+            class_owner=self.coach,
+        )
+        # Memory cache of another worker is not reached by invalidation
+        other_cache = LocMemCache("other-process", {})
+        with mock.patch("standards.scope.cache", other_cache):
+            self.assertEqual(OwnerScope(self.coach.pk).student_ids, frozenset())
+
+        student = create_student(student_class)
+
+        with mock.patch("standards.scope.cache", other_cache):
+            self.assertEqual(OwnerScope(self.coach.pk).student_ids, {student.pk})
@@ -0,0 +1,38 @@
+from django.urls import reverse
+
+from standards import models
+
+from .base import StandardsAPITestCase, create_student
+
+
+class SearchTests(StandardsAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        student_class = models.StudentClass.objects.create(
+            number=5,
+            class_name="А",
+            class_owner=self.coach,
+        )
+        for full_name in ("Иванов Иван", "Петров Пётр", "Сидорова Ивета", "Smith John"):
+            create_student(student_class, full_name)
+
+    def search(self, query: str) -> list[str]:
+        response = self.client.get(reverse("students-search"), {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [student["full_name"] for student in response.data]
+
+    def test_short_cyrillic_prefix(self):
+        self.assertEqual(self.search("ив"), ["Иванов Иван", "Сидорова Ивета"])
+        self.assertEqual(self.search("ИВ"), ["Иванов Иван", "Сидорова Ивета"])
+        self.assertEqual(self.search("пе"), ["Петров Пётр"])
+
+    def test_short_prefixes_of_several_words(self):
+        self.assertEqual(self.search("ив си"), ["Сидорова Ивета"])
+
+    def test_short_ascii_prefix(self):
+        self.assertEqual(self.search("jo"), ["Smith John"])
+
+    def test_cyrillic_words(self):
+        self.assertEqual(self.search("иванов"), ["Иванов Иван"])
+        self.assertEqual(self.search("петр"), ["Петров Пётр"])
@@ -0,0 +1,134 @@
+from django.urls import reverse
+
+from standards import models, sharing
+
+from .base import StandardsAPITestCase, create_standard, create_student, create_user
+
+
+def get_levels(level_numbers, value=1) -> list[dict]:
+    return [
+        {
+            "level_number": level_number,
+            "gender": gender,
+            "low_level_value": value,
+            "middle_level_value": value + 4,
+            "high_level_value": value + 8,
+        }
+        for level_number in level_numbers
+        for gender in models.Level.Gender.values
+    ]
+
+
+class StandardLevelsQueriesTests(StandardsAPITestCase):
+    """Levels are written by a fixed number of queries."""
+
+    create_queries = 7
+    update_queries = 15
+
+    def create(self, level_numbers) -> int:
+        response = self.client.post(
+            reverse("students-standards-list"),
+            {"name": "Бег", "has_numeric_value": True, "levels": get_levels(level_numbers)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data["levels"]), 2 * len(level_numbers))
+        return response.data["id"]
+
+    def update(self, standard_id, level_numbers, value):
+        response = self.client.put(
+            reverse("students-standards-detail", kwargs={"pk": standard_id}),
+            {"name": "Бег", "has_numeric_value": True, "levels": get_levels(level_numbers, value)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_create(self):
+        with self.assertNumQueries(self.create_queries):
+            self.create(range(1, 2))
+        with self.assertNumQueries(self.create_queries):
+            self.create(range(1, 12))
+
+    def test_update(self):
+        small_id = self.create(range(1, 3))
+        large_id = self.create(range(1, 12))
+
+        # Every level is changed, one level number is removed and one added
+        with self.assertNumQueries(self.update_queries):
+            self.update(small_id, range(2, 4), value=2)
+        with self.assertNumQueries(self.update_queries):
+            self.update(large_id, range(2, 13), value=2)
+
+        self.assertEqual(
+            models.Level.objects.filter(standard_id=large_id, low_level_value=2).count(),
+            22,
+        )
+        self.assertFalse(
+            models.Level.objects.filter(standard_id=large_id, level_number=1).exists(),
+        )
+
+
+class TemplateLevelsTests(StandardsAPITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.subscriber = create_user("subscriber@example.com")
+
+    def setUp(self):
+        super().setUp()
+        self.template = create_standard(self.coach, level_numbers=range(1, 4), is_template=True)
+        student_class = models.StudentClass.objects.create(
+            number=3,
+            class_name="А",
+            class_owner=self.subscriber,
+        )
+        self.student = create_student(student_class)
+        sharing.subscribe(self.subscriber, self.template)
+        models.StudentStandard.objects.create(
+            student=self.student,
+            standard=self.template,
+            value=5,
+            grade=4,
+        )
+
+    def update_levels(self, level_numbers):
+        return self.client.patch(
+            reverse("students-standards-detail", kwargs={"pk": self.template.pk}),
+            {"levels": get_levels(level_numbers)},
+            format="json",
+        )
+
+    def test_author_can_not_remove_levels_used_by_subscribers(self):
+        response = self.update_levels(range(1, 3))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.template.levels.count(), 6)
+        result = models.StudentStandard.global_objects.get(student=self.student)
+        self.assertEqual(result.level.level_number, 3)
+
+    def test_author_can_change_levels_used_by_subscribers(self):
+        response = self.update_levels(range(1, 5))
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.template.levels.count(), 8)
+        self.assertTrue(models.StudentStandard.objects.filter(student=self.student).exists())
+
+    def test_partial_update_keeps_levels(self):
+        response = self.client.patch(
+            reverse("students-standards-detail", kwargs={"pk": self.template.pk}),
+            {"name": "Прыжки"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.template.levels.count(), 6)
+
+    def test_results_are_kept_on_removal_of_their_level(self):
+        sharing.unsubscribe(self.subscriber, self.template)
+
+        response = self.update_levels(range(1, 3))
+
+        self.assertEqual(response.status_code, 200, response.data)
+        result = models.StudentStandard.global_objects.get(student=self.student)
+        self.assertIsNone(result.level)
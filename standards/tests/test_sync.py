@@ -0,0 +1,48 @@
+import datetime
+
+from django.urls import reverse
+from django.utils import timezone
+
+from standards import models
+
+from .base import StandardsAPITestCase, create_standard, create_student
+
+
+class SyncResultsTests(StandardsAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        student_class = models.StudentClass.objects.create(
+            number=5,
+            class_name="А",
+            class_owner=self.coach,
+        )
+        self.student = create_student(student_class)
+        self.standard = create_standard(self.coach)
+
+    def upload(self, recorded_at: datetime.datetime):
+        response = self.client.post(
+            reverse("sync-results"),
+            [{
+                "student_id": self.student.pk,
+                "standard_id": self.standard.pk,
+                "value": 6,
+                "recorded_at": recorded_at.isoformat(),
+            }],
+            format="json",
+        )
+        return response.data[0]["status"]
+
+    def test_repeated_upload_is_duplicate(self):
+        # Clock of the client runs a bit ahead
+        recorded_at = timezone.now() + datetime.timedelta(minutes=1)
+
+        self.assertEqual(self.upload(recorded_at), "applied")
+        self.assertEqual(self.upload(recorded_at), "duplicate")
+        self.assertEqual(models.StudentStandardAttempt.objects.count(), 1)
+
+    def test_future_result_is_refused(self):
+        status = self.upload(timezone.now() + datetime.timedelta(days=1))
+
+        self.assertEqual(status, "error")
+        self.assertFalse(models.StudentStandard.objects.exists())
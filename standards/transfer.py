@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import models
+from .scope import invalidate_owner_scope
+
+
+def transfer_students(students, student_class) -> dict[str, int]:
+    """Move students to another class.
+
+    Students are moved by one update and their results are re-linked to
+    levels of the new class number, so number of queries does not depend
+    on number of students.
+
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        student_ids = list(students.values_list("id", flat=True))
+        transferred_count = models.Student.objects.filter(
+            id__in=student_ids,
+        ).update(student_class=student_class, updated_at=now)
+        relinked_results_count = models.StudentStandard.objects.filter(
+            student_id__in=student_ids,
+        ).relink_levels()
+
+    invalidate_owner_scope(student_class.class_owner_id)
+    return {
+        "transferred_students": transferred_count,
+        "relinked_results": relinked_results_count,
+    }
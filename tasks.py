@@ -31,6 +31,16 @@ def migrate(context):
     manage(context, "migrate")
 
 
+@task
+def test(context):
+    manage(context, "test")
+
+
+@task
+def clear_sessions(context):
+    manage(context, "clear_expired_sessions")
+
+
 @task
 def django_shell(context):
     manage(context, "shell_plus")